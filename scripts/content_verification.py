@@ -1,11 +1,25 @@
 import json
 import os
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from pptx import Presentation
 from extract_slide_details import extract_slide_details
 from advanced_placeholder_matcher import AdvancedPlaceholderMatcher, apply_advanced_content_matching
 
+@lru_cache(maxsize=4)
+def _load_presentation_cached(presentation_path: str, mtime_ns: int, size: int):
+    """Open a presentation once per (path, mtime, size); a rewritten file gets a new cache key"""
+    return Presentation(presentation_path)
+
+def load_presentation_readonly(presentation_path: str):
+    """
+    Load a presentation for reading, reusing the parsed package while the file is unchanged.
+    The returned object is shared between callers and must not be modified.
+    """
+    st = os.stat(presentation_path)
+    return _load_presentation_cached(presentation_path, st.st_mtime_ns, st.st_size)
+
 @dataclass
 class ContentMismatch:
     """Represents a content verification issue"""
@@ -69,7 +83,9 @@ class ContentVerifier:
     def verify_presentation_content(self, 
                                   presentation_path: str, 
                                   intended_json_path: str,
-                                  auto_fix_critical: bool = False) -> VerificationResult:
+                                  auto_fix_critical: bool = False,
+                                  presentation=None,
+                                  intended_content: Optional[List[Dict]] = None) -> VerificationResult:
         """
         Main verification method that compares presentation content with intended content.
         
@@ -77,6 +93,9 @@ class ContentVerifier:
             presentation_path: Path to the final presentation file
             intended_json_path: Path to the JSON file with intended content
             auto_fix_critical: Whether to attempt automatic fixing of critical issues
+            presentation: Already loaded Presentation to verify instead of re-opening
+                presentation_path (repairs are applied to it in place)
+            intended_content: Already parsed intended content instead of re-reading intended_json_path
             
         Returns:
             VerificationResult object with detailed analysis
@@ -90,12 +109,13 @@ class ContentVerifier:
         
         try:
             # Extract actual content from presentation
-            actual_content = self._extract_actual_content(presentation_path)
+            actual_content = self._extract_actual_content(presentation_path, presentation)
             if not actual_content:
                 return self._create_failed_result("Failed to extract content from presentation")
             
             # Load intended content from JSON
-            intended_content = self._load_intended_content(intended_json_path)
+            if intended_content is None:
+                intended_content = self._load_intended_content(intended_json_path)
             if not intended_content:
                 return self._create_failed_result("Failed to load intended content from JSON")
             
@@ -129,13 +149,13 @@ class ContentVerifier:
                     print("-" * 50)
                     
                     repair_results = self._fix_critical_issues(
-                        presentation_path, intended_content, critical_issues
+                        presentation_path, intended_content, critical_issues, presentation
                     )
                     result.repair_results = repair_results
                     
                     # Re-verify after repairs
                     post_repair_result = self._post_repair_verification(
-                        presentation_path, intended_json_path
+                        presentation_path, intended_json_path, presentation, intended_content
                     )
                     result.post_repair_mismatches = post_repair_result.mismatches
                     result.post_repair_success_rate = post_repair_result.success_rate
@@ -147,13 +167,15 @@ class ContentVerifier:
             print(f"❌ Error during content verification: {e}")
             return self._create_failed_result(f"Verification error: {e}")
     
-    def _extract_actual_content(self, presentation_path: str) -> Optional[List[Dict]]:
-        """Extract content from the actual presentation file"""
+    def _extract_actual_content(self, presentation_path: str, presentation=None) -> Optional[List[Dict]]:
+        """Extract content from the actual presentation file (or an already loaded Presentation)"""
         try:
             if self.debug:
                 print(f"   📄 Extracting content from: {presentation_path}")
             
-            actual_content = extract_slide_details(presentation_path)
+            if presentation is None:
+                presentation = load_presentation_readonly(presentation_path)
+            actual_content = extract_slide_details(presentation)
             
             if actual_content:
                 if self.debug:
@@ -227,6 +249,9 @@ class ContentVerifier:
         mismatches = []
         
         actual_shapes = {shape.get("name", ""): shape for shape in actual_slide.get("shapes", [])}
+        actual_shapes_by_type = {}
+        for shape in actual_shapes.values():
+            actual_shapes_by_type.setdefault(shape.get("placeholder_type", ""), []).append(shape)
         intended_shapes = intended_slide.get("shapes", [])
         
         for intended_shape in intended_shapes:
@@ -242,7 +267,8 @@ class ContentVerifier:
                 continue
             
             # Find matching actual shape
-            actual_shape = self._find_matching_actual_shape(shape_name, placeholder_type, actual_shapes, intended_shape)
+            actual_shape = self._find_matching_actual_shape(shape_name, placeholder_type, actual_shapes, intended_shape,
+                                                            actual_shapes_by_type)
             
             if not actual_shape:
                 mismatches.append(ContentMismatch(
@@ -266,12 +292,26 @@ class ContentVerifier:
         
         return mismatches
     
-    def _find_matching_actual_shape(self, shape_name: str, placeholder_type: str, actual_shapes: Dict, intended_shape: Dict) -> Optional[Dict]:
+    def _find_matching_actual_shape(self, shape_name: str, placeholder_type: str, actual_shapes: Dict, intended_shape: Dict,
+                                    actual_shapes_by_type: Optional[Dict[str, List[Dict]]] = None) -> Optional[Dict]:
         """Find the best matching actual shape for an intended shape"""
         # Try exact name match first
         if shape_name in actual_shapes:
             return actual_shapes[shape_name]
         
+        # Same-type shapes score below zero when close enough and always beat other types,
+        # so only scan every shape when no same-type shape is nearby
+        if actual_shapes_by_type is not None:
+            same_type_shapes = actual_shapes_by_type.get(placeholder_type, [])
+            best_match, best_score = self._best_position_match(placeholder_type, same_type_shapes, intended_shape)
+            if best_score < 0:
+                return best_match
+        
+        best_match, best_score = self._best_position_match(placeholder_type, actual_shapes.values(), intended_shape)
+        return best_match if best_score < 50 else None  # Reasonable threshold
+    
+    def _best_position_match(self, placeholder_type: str, candidate_shapes, intended_shape: Dict) -> Tuple[Optional[Dict], float]:
+        """Score candidate shapes by placeholder type and position, returning the best one and its score"""
         # Try matching by placeholder type and position
         intended_left = intended_shape.get("left_inches", 0)
         intended_top = intended_shape.get("top_inches", 0)
@@ -279,7 +319,7 @@ class ContentVerifier:
         best_match = None
         best_score = float('inf')
         
-        for actual_shape in actual_shapes.values():
+        for actual_shape in candidate_shapes:
             actual_type = actual_shape.get("placeholder_type", "")
             actual_left = actual_shape.get("left_inches", 0)
             actual_top = actual_shape.get("top_inches", 0)
@@ -301,7 +341,7 @@ class ContentVerifier:
                 best_score = score
                 best_match = actual_shape
         
-        return best_match if best_score < 50 else None  # Reasonable threshold
+        return best_match, best_score
     
     def _analyze_content_match(self, slide_index: int, shape_name: str, placeholder_type: str, intended_text: str, actual_text: str) -> Optional[ContentMismatch]:
         """Analyze if content matches and identify specific issues"""
@@ -558,7 +598,8 @@ class ContentVerifier:
     def _fix_critical_issues(self, 
                            presentation_path: str, 
                            intended_content: List[Dict], 
-                           critical_issues: List[ContentMismatch]) -> List[RepairResult]:
+                           critical_issues: List[ContentMismatch],
+                           presentation=None) -> List[RepairResult]:
         """
         Attempt to fix critical issues by applying correct content to problematic shapes.
         
@@ -566,6 +607,7 @@ class ContentVerifier:
             presentation_path: Path to the presentation file
             intended_content: JSON data with intended slide data
             critical_issues: List of critical issues to fix
+            presentation: Already loaded Presentation to repair in place
             
         Returns:
             List of RepairResult objects showing what was attempted and results
@@ -574,7 +616,7 @@ class ContentVerifier:
         
         try:
             # Load presentation for editing
-            prs = Presentation(presentation_path)
+            prs = presentation if presentation is not None else Presentation(presentation_path)
             
             # Group issues by slide for efficient processing
             issues_by_slide = {}
@@ -767,13 +809,17 @@ class ContentVerifier:
     
     def _post_repair_verification(self, 
                                 presentation_path: str, 
-                                intended_json_path: str) -> VerificationResult:
+                                intended_json_path: str,
+                                presentation=None,
+                                intended_content: Optional[List[Dict]] = None) -> VerificationResult:
         """
         Perform verification after repairs to check improvement.
         
         Args:
             presentation_path: Path to the repaired presentation
             intended_json_path: Path to the JSON file with intended content
+            presentation: Repaired Presentation still in memory, to avoid reloading the saved file
+            intended_content: Already parsed intended content
             
         Returns:
             VerificationResult with post-repair status
@@ -784,7 +830,8 @@ class ContentVerifier:
         # Create a new verifier instance without auto-fix to avoid recursion
         verifier = ContentVerifier(debug=False)
         result = verifier.verify_presentation_content(
-            presentation_path, intended_json_path, auto_fix_critical=False
+            presentation_path, intended_json_path, auto_fix_critical=False,
+            presentation=presentation, intended_content=intended_content
         )
         
         return result
@@ -792,7 +839,9 @@ class ContentVerifier:
 def verify_presentation_content(presentation_path: str, 
                                intended_json_path: str, 
                                debug: bool = False,
-                               auto_fix_critical: bool = False) -> VerificationResult:
+                               auto_fix_critical: bool = False,
+                               presentation=None,
+                               intended_content: Optional[List[Dict]] = None) -> VerificationResult:
     """
     Convenience function to verify presentation content.
     
@@ -801,13 +850,16 @@ def verify_presentation_content(presentation_path: str,
         intended_json_path: Path to the JSON file with intended content
         debug: Enable debug output
         auto_fix_critical: Whether to attempt automatic fixing of critical issues
+        presentation: Optional already loaded Presentation (repairs are applied to it in place)
+        intended_content: Optional already parsed intended content
         
     Returns:
         VerificationResult object
     """
     verifier = ContentVerifier(debug=debug)
     return verifier.verify_presentation_content(
-        presentation_path, intended_json_path, auto_fix_critical=auto_fix_critical
+        presentation_path, intended_json_path, auto_fix_critical=auto_fix_critical,
+        presentation=presentation, intended_content=intended_content
     )
 
 if __name__ == "__main__":
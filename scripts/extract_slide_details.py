@@ -19,12 +19,16 @@ def extract_slide_details(presentation_path):
     """
     Extracts detailed information about each slide in a PowerPoint presentation.
     Includes shapes, their properties, and text content.
+    Accepts either a file path or an already loaded Presentation object.
     """
-    try:
-        prs = Presentation(presentation_path)
-    except Exception as e:
-        print(f"Error loading presentation '{presentation_path}': {e}")
-        return None
+    if hasattr(presentation_path, "slides"):
+        prs = presentation_path
+    else:
+        try:
+            prs = Presentation(presentation_path)
+        except Exception as e:
+            print(f"Error loading presentation '{presentation_path}': {e}")
+            return None
 
     all_slides_data = []
 
@@ -15,6 +15,7 @@ from extract_slide_details import extract_slide_details
 from intelligent_slide_organizer import intelligent_slide_organization_step
 from create_presentation_from_reorganized_json import create_and_update_reorganized_presentation
 from template_management import select_dual_templates, TemplateMatch, ImprovedTemplateDownloader
+from template_management.intelligent_template_selector_dual import setup_console_logging
 from content_verification import verify_presentation_content
 
 # --- Configuration: File Paths ---
@@ -619,6 +620,9 @@ Examples:
     
     args = parser.parse_args()
     
+    # Show template selection progress as plain console lines
+    setup_console_logging()
+    
     # Handle --cleanall as standalone operation (no workflow execution)
     if args.cleanall:
         print("🗑️  JUNIORAI CLEANUP ONLY MODE")
@@ -14,27 +14,30 @@ Usage:
     from template_management import select_dual_templates, ImprovedTemplateDownloader
 """
 
-# Import main functions for easy access
-from .intelligent_template_selector_dual import (
-    select_dual_templates,
-    select_templates_for_content,
-    TemplateMatch,
-    DualTemplateSelector
-)
-
-from .improved_template_downloader import (
-    ImprovedTemplateDownloader,
-    TemplateDownloadInfo
-)
-
-from .simple_template_downloader import (
-    SimpleTemplateDownloader,
-    SimpleTemplateInfo
-)
-
-from .select_and_download_templates import (
-    select_templates
-)
+import importlib
+
+# Public names and the submodule defining each. Submodules are imported on first
+# access, so importing one tool (e.g. the simple downloader) doesn't also load
+# Gemini and Selenium through this package.
+_EXPORTS = {
+    'select_dual_templates': '.intelligent_template_selector_dual',
+    'select_templates_for_content': '.intelligent_template_selector_dual',
+    'TemplateMatch': '.intelligent_template_selector_dual',
+    'DualTemplateSelector': '.intelligent_template_selector_dual',
+    'ImprovedTemplateDownloader': '.improved_template_downloader',
+    'TemplateDownloadInfo': '.improved_template_downloader',
+    'SimpleTemplateDownloader': '.simple_template_downloader',
+    'SimpleTemplateInfo': '.simple_template_downloader',
+    'select_templates': '.select_and_download_templates',
+}
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     # Template Selection
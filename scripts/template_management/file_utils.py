@@ -0,0 +1,52 @@
+"""
+Shared file helpers for the template management tools and the presentation scripts.
+
+orjson is optional: JSON goes through it when it is installed and through the
+stdlib json module otherwise, so callers don't repeat the fallback themselves.
+"""
+
+import json
+import os
+import string
+
+# orjson is optional; fall back to the stdlib json module when it is missing
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Characters kept in safe filenames; everything else in ASCII is deleted by str.translate
+_SAFE_FILENAME_CHARS = set(string.ascii_letters + string.digits + ' -_')
+_SAFE_FILENAME_TABLE = str.maketrans({chr(c): None for c in range(128) if chr(c) not in _SAFE_FILENAME_CHARS})
+
+def json_loads(raw_data):
+    """Parse a JSON document from bytes or str (errors are json.JSONDecodeError subclasses)"""
+    return orjson.loads(raw_data) if ORJSON_AVAILABLE else json.loads(raw_data)
+
+def load_json_file(path):
+    """Read and parse a UTF-8 JSON file"""
+    with open(path, 'rb') as f:
+        return json_loads(f.read())
+
+def json_dumps(data, indent: bool = False) -> bytes:
+    """Serialize data to UTF-8 JSON bytes, indented by two spaces if requested"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+def safe_title(title: str) -> str:
+    """Strip a template title down to characters that are safe in a filename"""
+    if title.isascii():
+        safe = title.translate(_SAFE_FILENAME_TABLE)
+    else:
+        # Keep non-ASCII letters and digits, matching str.isalnum
+        safe = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_'))
+    return safe.rstrip().replace(' ', '_')
+
+def stat_or_none(path: str):
+    """Return os.stat(path), or None if the file can't be found"""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
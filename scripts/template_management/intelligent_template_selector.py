@@ -1,16 +1,151 @@
+import functools
 import json
 import os
 import sys
 import logging
+import random
 import time
 from pathlib import Path
 import google.generativeai as genai
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
-@dataclass
+# Backoff bounds (seconds) for retried Gemini requests
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+
+# Fields every template entry is expected to provide
+REQUIRED_TEMPLATE_KEYS = frozenset(['id', 'title', 'category', 'theme', 'use_cases'])
+
+# System instruction carrying the templates catalog. It is set once per loaded
+# database so each request only sends the user-specific part of the prompt.
+CATALOG_SYSTEM_INSTRUCTION = """
+You are an expert presentation consultant who recommends PowerPoint templates from the catalog below.
+
+AVAILABLE TEMPLATES:
+{templates_summary}
+"""
+
+# Prompt skeletons, filled with str.format_map at request time
+SINGLE_SELECTION_PROMPT = """
+Analyze the user's content and requirements to select the BEST PowerPoint template from the available templates.
+
+USER CONTENT:
+{user_content}
+{requirements_text}
+
+Your task is to:
+1. Analyze the user's content theme, purpose, and target audience
+2. Match content requirements with template features and capabilities
+3. Consider presentation complexity and slide count needs
+4. Select the single BEST template that maximizes content-template alignment
+
+Respond with a JSON object in this exact format:
+{{
+    "selected_template_id": "ms_template_XXX",
+    "template_title": "Template Name",
+    "confidence_score": 0.95,
+    "reasoning": "Detailed explanation of why this template is the best choice",
+    "matching_criteria": ["criterion1", "criterion2", "criterion3"],
+    "suitability_factors": {{
+        "content_alignment": 0.9,
+        "design_appropriateness": 0.85,
+        "feature_match": 0.8,
+        "complexity_fit": 0.9,
+        "use_case_match": 0.95
+    }}
+}}
+
+Consider these factors:
+- Content theme and professional level
+- Required slide types and layouts
+- Visual design preferences
+- Presentation complexity
+- Target audience appropriateness
+- Feature requirements (charts, timelines, etc.)
+
+Return ONLY the JSON response, no additional text.
+"""
+
+MULTI_SELECTION_PROMPT = """
+Analyze the user's content and provide the top {top_n} PowerPoint template recommendations from the available templates.
+
+USER CONTENT:
+{user_content}
+{requirements_text}
+
+Provide the top {top_n} template recommendations ranked by suitability. Consider:
+- Content theme and purpose alignment
+- Design appropriateness for the content
+- Required features and layouts
+- Presentation complexity needs
+- Target audience fit
+
+Respond with a JSON array of recommendations:
+[
+    {{
+        "selected_template_id": "ms_template_XXX",
+        "template_title": "Template Name",
+        "confidence_score": 0.95,
+        "reasoning": "Why this template is recommended",
+        "matching_criteria": ["criterion1", "criterion2"],
+        "suitability_factors": {{
+            "content_alignment": 0.9,
+            "design_appropriateness": 0.85,
+            "feature_match": 0.8,
+            "complexity_fit": 0.9,
+            "use_case_match": 0.95
+        }}
+    }}
+]
+
+Return ONLY the JSON array, no additional text.
+"""
+
+# Response schemas for structured output, written as plain OpenAPI-style dicts:
+# genai only converts TypedDict schemas built with typing_extensions and wrapped in
+# the built-in list[...] generic, which older interpreters can't evaluate
+SUITABILITY_FACTORS_KEYS = ('content_alignment', 'design_appropriateness', 'feature_match',
+                            'complexity_fit', 'use_case_match')
+
+# Response schema Gemini must follow for each recommendation
+RECOMMENDATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "selected_template_id": {"type": "string"},
+        "template_title": {"type": "string"},
+        "confidence_score": {"type": "number"},
+        "reasoning": {"type": "string"},
+        "matching_criteria": {"type": "array", "items": {"type": "string"}},
+        "suitability_factors": {
+            "type": "object",
+            "properties": {key: {"type": "number"} for key in SUITABILITY_FACTORS_KEYS},
+            "required": list(SUITABILITY_FACTORS_KEYS)
+        }
+    },
+    "required": ["selected_template_id", "template_title", "confidence_score", "reasoning",
+                 "matching_criteria", "suitability_factors"]
+}
+
+RECOMMENDATIONS_SCHEMA = {"type": "array", "items": RECOMMENDATION_SCHEMA}
+
+@functools.lru_cache(maxsize=8)
+def _get_model(api_key: str, model_name: str, system_instruction: Optional[str] = None):
+    """
+    Return a process-wide Gemini model so selectors share its HTTP connection.
+    
+    Models are kept per API key but don't configure genai themselves: a model picks
+    up genai's process-global client on its first request, so the key is set right
+    before each request (see _make_ai_request_with_retry).
+    """
+    return genai.GenerativeModel(model_name, system_instruction=system_instruction)
+
+@dataclass(frozen=True)
 class TemplateRecommendation:
     """Represents a template recommendation with reasoning"""
+    __slots__ = ('template_id', 'template_title', 'confidence_score',
+                 'reasoning', 'matching_criteria', 'suitability_factors')
+
     template_id: str
     template_title: str
     confidence_score: float
@@ -28,8 +163,7 @@ class IntelligentTemplateSelector:
         self.logger = self._setup_logging(log_level)
         
         try:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel(model_name)
+            self.model = _get_model(api_key, model_name)
             self.logger.info(f"Initialized Gemini AI model: {model_name}")
         except Exception as e:
             self.logger.error(f"Failed to initialize Gemini AI: {e}")
@@ -73,6 +207,13 @@ class IntelligentTemplateSelector:
             if not self._validate_database_structure():
                 return False
             
+            # Bind the catalog to the model once instead of resending it in every prompt
+            templates_summary = self._prepare_templates_summary()
+            self.model = _get_model(
+                self.api_key, self.model_name,
+                CATALOG_SYSTEM_INSTRUCTION.format_map({"templates_summary": templates_summary})
+            )
+            
             total_templates = self.templates_data['metadata']['total_templates']
             self.logger.info(f"Successfully loaded {total_templates} templates from database")
             return True
@@ -101,14 +242,23 @@ class IntelligentTemplateSelector:
                 self.logger.error("Templates data is not a list")
                 return False
             
-            # Validate at least one template has required fields
-            if self.templates_data['templates']:
-                first_template = self.templates_data['templates'][0]
-                required_template_keys = ['id', 'title', 'category', 'theme', 'use_cases']
+            # Validate every template in a single pass
+            missing_keys = set()
+            incomplete_templates = 0
+            for template in self.templates_data['templates']:
+                if not isinstance(template, dict):
+                    self.logger.error("Template entry is not a dictionary")
+                    return False
                 
-                for key in required_template_keys:
-                    if key not in first_template:
-                        self.logger.warning(f"Template missing recommended key: {key}")
+                missing = REQUIRED_TEMPLATE_KEYS.difference(template)
+                if missing:
+                    incomplete_templates += 1
+                    missing_keys.update(missing)
+            
+            if incomplete_templates:
+                self.logger.warning(
+                    f"{incomplete_templates} templates missing recommended keys: {', '.join(sorted(missing_keys))}"
+                )
             
             return True
             
@@ -132,21 +282,18 @@ class IntelligentTemplateSelector:
             return None
         
         try:
-            # Prepare templates summary for AI analysis
-            templates_summary = self._prepare_templates_summary()
-            
             # Create AI prompt for template selection
-            prompt = self._create_selection_prompt(user_content, user_requirements, templates_summary)
+            prompt = self._create_selection_prompt(user_content, user_requirements)
             
             self.logger.info("Analyzing user content and selecting best template...")
             
             # Make API call with retry logic
-            response = self._make_ai_request_with_retry(prompt, max_retries=3)
-            if not response:
+            response_text = self._make_ai_request_with_retry(prompt, RECOMMENDATION_SCHEMA, max_retries=3)
+            if not response_text:
                 return None
             
             # Parse AI response
-            recommendation = self._parse_ai_response(response.text)
+            recommendation = self._parse_ai_response(response_text)
             
             if recommendation:
                 self.logger.info(f"Selected template: {recommendation.template_title}")
@@ -161,21 +308,35 @@ class IntelligentTemplateSelector:
             self.logger.error(f"Error during template selection: {e}")
             return None
     
-    def _make_ai_request_with_retry(self, prompt: str, max_retries: int = 3):
-        """Make AI request with retry logic for server stability"""
+    def _make_ai_request_with_retry(self, prompt: str, response_schema, max_retries: int = 3) -> Optional[str]:
+        """Make a streamed AI request with retry logic and return the full response text"""
+        # Structured output guarantees the response is bare JSON matching the schema
+        generation_config = genai.GenerationConfig(
+            response_mime_type="application/json",
+            response_schema=response_schema
+        )
+        
+        # genai's API key is process-global and may have been set for another key since
+        genai.configure(api_key=self.api_key)
+        
         for attempt in range(max_retries):
             try:
-                response = self.model.generate_content(prompt)
-                return response
+                # Stream so chunks are received while the model is still generating;
+                # a connection dropped mid-stream is retried like any other failure
+                chunks = []
+                for chunk in self.model.generate_content(prompt, generation_config=generation_config, stream=True):
+                    chunks.append(chunk.text)
+                return "".join(chunks)
             except Exception as e:
                 self.logger.warning(f"AI request attempt {attempt + 1} failed: {e}")
                 if attempt == max_retries - 1:
                     self.logger.error(f"AI request failed after {max_retries} attempts")
                     return None
                 
-                # Exponential backoff
-                wait_time = 2 ** attempt
-                self.logger.info(f"Retrying in {wait_time} seconds...")
+                # Capped exponential backoff with full jitter so concurrent
+                # workers don't retry in lockstep when Gemini degrades
+                wait_time = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+                self.logger.info(f"Retrying in {wait_time:.2f} seconds...")
                 time.sleep(wait_time)
         
         return None
@@ -186,13 +347,14 @@ class IntelligentTemplateSelector:
             return []
         
         try:
-            templates_summary = self._prepare_templates_summary()
-            prompt = self._create_multi_selection_prompt(user_content, user_requirements, templates_summary, top_n)
+            prompt = self._create_multi_selection_prompt(user_content, user_requirements, top_n)
             
             print(f"🤖 Getting top {top_n} template recommendations...")
-            response = self.model.generate_content(prompt)
+            response_text = self._make_ai_request_with_retry(prompt, RECOMMENDATIONS_SCHEMA, max_retries=3)
+            if not response_text:
+                return []
             
-            recommendations = self._parse_multi_ai_response(response.text)
+            recommendations = self._parse_multi_ai_response(response_text)
             
             if recommendations:
                 print(f"✅ Generated {len(recommendations)} recommendations")
@@ -226,135 +388,29 @@ class IntelligentTemplateSelector:
         
         return "\n".join(summary_parts)
     
-    def _create_selection_prompt(self, user_content: str, user_requirements: Optional[str], templates_summary: str) -> str:
+    def _create_selection_prompt(self, user_content: str, user_requirements: Optional[str]) -> str:
         """Create AI prompt for single template selection"""
         requirements_text = f"\nAdditional Requirements: {user_requirements}" if user_requirements else ""
         
-        return f"""
-You are an expert presentation consultant. Analyze the user's content and requirements to select the BEST PowerPoint template from the available options.
-
-USER CONTENT:
-{user_content}
-{requirements_text}
-
-AVAILABLE TEMPLATES:
-{templates_summary}
-
-Your task is to:
-1. Analyze the user's content theme, purpose, and target audience
-2. Match content requirements with template features and capabilities
-3. Consider presentation complexity and slide count needs
-4. Select the single BEST template that maximizes content-template alignment
-
-Respond with a JSON object in this exact format:
-{{
-    "selected_template_id": "ms_template_XXX",
-    "template_title": "Template Name",
-    "confidence_score": 0.95,
-    "reasoning": "Detailed explanation of why this template is the best choice",
-    "matching_criteria": ["criterion1", "criterion2", "criterion3"],
-    "suitability_factors": {{
-        "content_alignment": 0.9,
-        "design_appropriateness": 0.85,
-        "feature_match": 0.8,
-        "complexity_fit": 0.9,
-        "use_case_match": 0.95
-    }}
-}}
-
-Consider these factors:
-- Content theme and professional level
-- Required slide types and layouts
-- Visual design preferences
-- Presentation complexity
-- Target audience appropriateness
-- Feature requirements (charts, timelines, etc.)
-
-Return ONLY the JSON response, no additional text.
-"""
+        return SINGLE_SELECTION_PROMPT.format_map({
+            "user_content": user_content,
+            "requirements_text": requirements_text,
+        })
     
-    def _create_multi_selection_prompt(self, user_content: str, user_requirements: Optional[str], templates_summary: str, top_n: int) -> str:
+    def _create_multi_selection_prompt(self, user_content: str, user_requirements: Optional[str], top_n: int) -> str:
         """Create AI prompt for multiple template recommendations"""
         requirements_text = f"\nAdditional Requirements: {user_requirements}" if user_requirements else ""
         
-        return f"""
-You are an expert presentation consultant. Analyze the user's content and provide the top {top_n} PowerPoint template recommendations.
-
-USER CONTENT:
-{user_content}
-{requirements_text}
-
-AVAILABLE TEMPLATES:
-{templates_summary}
-
-Provide the top {top_n} template recommendations ranked by suitability. Consider:
-- Content theme and purpose alignment
-- Design appropriateness for the content
-- Required features and layouts
-- Presentation complexity needs
-- Target audience fit
-
-Respond with a JSON array of recommendations:
-[
-    {{
-        "selected_template_id": "ms_template_XXX",
-        "template_title": "Template Name",
-        "confidence_score": 0.95,
-        "reasoning": "Why this template is recommended",
-        "matching_criteria": ["criterion1", "criterion2"],
-        "suitability_factors": {{
-            "content_alignment": 0.9,
-            "design_appropriateness": 0.85,
-            "feature_match": 0.8,
-            "complexity_fit": 0.9,
-            "use_case_match": 0.95
-        }}
-    }}
-]
-
-Return ONLY the JSON array, no additional text.
-"""
+        return MULTI_SELECTION_PROMPT.format_map({
+            "user_content": user_content,
+            "requirements_text": requirements_text,
+            "top_n": top_n,
+        })
     
     def _parse_ai_response(self, response_text: str) -> Optional[TemplateRecommendation]:
         """Parse AI response for single template selection"""
         try:
-            # Clean response text
-            response_text = response_text.strip()
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            
-            # Find JSON object
-            start_idx = response_text.find('{')
-            if start_idx == -1:
-                return None
-            
-            brace_count = 0
-            end_idx = start_idx
-            for i, char in enumerate(response_text[start_idx:], start_idx):
-                if char == '{':
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        end_idx = i + 1
-                        break
-            
-            json_text = response_text[start_idx:end_idx]
-            data = json.loads(json_text)
-            
-            return TemplateRecommendation(
-                template_id=data["selected_template_id"],
-                template_title=data["template_title"],
-                confidence_score=data["confidence_score"],
-                reasoning=data["reasoning"],
-                matching_criteria=data["matching_criteria"],
-                suitability_factors=data["suitability_factors"]
-            )
-            
+            return self._recommendation_from_dict(json.loads(response_text))
         except Exception as e:
             print(f"Error parsing AI response: {e}")
             return None
@@ -362,52 +418,23 @@ Return ONLY the JSON array, no additional text.
     def _parse_multi_ai_response(self, response_text: str) -> List[TemplateRecommendation]:
         """Parse AI response for multiple template recommendations"""
         try:
-            # Clean response text
-            response_text = response_text.strip()
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            
-            # Find JSON array
-            start_idx = response_text.find('[')
-            if start_idx == -1:
-                return []
-            
-            bracket_count = 0
-            end_idx = start_idx
-            for i, char in enumerate(response_text[start_idx:], start_idx):
-                if char == '[':
-                    bracket_count += 1
-                elif char == ']':
-                    bracket_count -= 1
-                    if bracket_count == 0:
-                        end_idx = i + 1
-                        break
-            
-            json_text = response_text[start_idx:end_idx]
-            data = json.loads(json_text)
-            
-            recommendations = []
-            for item in data:
-                rec = TemplateRecommendation(
-                    template_id=item["selected_template_id"],
-                    template_title=item["template_title"],
-                    confidence_score=item["confidence_score"],
-                    reasoning=item["reasoning"],
-                    matching_criteria=item["matching_criteria"],
-                    suitability_factors=item["suitability_factors"]
-                )
-                recommendations.append(rec)
-            
-            return recommendations
-            
+            return [self._recommendation_from_dict(item) for item in json.loads(response_text)]
         except Exception as e:
             print(f"Error parsing multi AI response: {e}")
             return []
     
+    @staticmethod
+    def _recommendation_from_dict(data: Dict) -> TemplateRecommendation:
+        """Build a TemplateRecommendation from a schema-conformant response object"""
+        return TemplateRecommendation(
+            template_id=data["selected_template_id"],
+            template_title=data["template_title"],
+            confidence_score=data["confidence_score"],
+            reasoning=data["reasoning"],
+            matching_criteria=data["matching_criteria"],
+            suitability_factors=data["suitability_factors"]
+        )
+    
     def get_template_details(self, template_id: str) -> Optional[Dict]:
         """Get full details of a specific template"""
         if not self.templates_data:
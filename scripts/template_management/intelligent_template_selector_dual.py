@@ -1,15 +1,61 @@
+import asyncio
+import hashlib
 import json
+import math
 import os
 import logging
+import re
+import sqlite3
+import sys
+import threading
 import time
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+try:
+    from .file_utils import json_dumps, json_loads
+except ImportError:  # Run as a standalone script from this directory
+    from file_utils import json_dumps, json_loads
+
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+def setup_console_logging(level: int = logging.INFO):
+    """Print this module's log messages as-is on stdout, like the CLI output they replace"""
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+
+# Catalogs with more templates than this are narrowed by keyword ranking before prompting
+# Gemini; the bundled catalog (50 templates) stays below it and is always sent whole
+PREFILTER_MIN_TEMPLATES = 200
+
+# Number of keyword-ranked candidate templates sent to Gemini for large catalogs
+PREFILTER_TOP_K = 50
+
+# Per-template field budgets for the summary sent to Gemini
+SUMMARY_MAX_DESCRIPTION_CHARS = 240
+SUMMARY_MAX_USE_CASES = 12
+
+# BM25 ranking parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Loaded selectors reused across select_dual_templates calls, keyed by
+# (api key hash, model, templates path, cache path) -> (templates mtime, selector)
+_SELECTOR_CACHE: Dict[Tuple[str, str, str, Optional[str]], Tuple[float, "DualTemplateSelector"]] = {}
+
 @dataclass
 class TemplateMatch:
     """Represents a template match with detailed scoring"""
@@ -22,42 +68,272 @@ class TemplateMatch:
     design_suitability: float
     content_compatibility: float
 
+def _clip(text: str, max_chars: int) -> str:
+    """Truncate text to max_chars, marking the cut with an ellipsis"""
+    return text if len(text) <= max_chars else text[:max_chars - 1] + '…'
+
+def _match_to_dict(match: TemplateMatch) -> Dict:
+    """Shallow dict of a TemplateMatch; avoids the recursive deepcopy done by dataclasses.asdict"""
+    data = dict(vars(match))
+    data["matching_factors"] = dict(match.matching_factors)
+    return data
+
+# Response schema for structured output, written as a plain OpenAPI-style dict:
+# genai only converts TypedDict schemas built with typing_extensions and wrapped in
+# the built-in list[...] generic, which older interpreters can't evaluate
+MATCHING_FACTORS_KEYS = ('content_compatibility', 'use_case_alignment', 'design_suitability',
+                         'layout_appropriateness', 'professional_fit')
+
+# Gemini must return an array of these, one per selected template
+TEMPLATE_MATCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "template_id": {"type": "string"},
+        "template_title": {"type": "string"},
+        "confidence_score": {"type": "number"},
+        "reasoning": {"type": "string"},
+        "matching_factors": {
+            "type": "object",
+            "properties": {key: {"type": "number"} for key in MATCHING_FACTORS_KEYS},
+            "required": list(MATCHING_FACTORS_KEYS)
+        },
+        "use_case_alignment": {"type": "number"},
+        "design_suitability": {"type": "number"},
+        "content_compatibility": {"type": "number"}
+    },
+    "required": ["template_id", "template_title", "confidence_score", "reasoning", "matching_factors",
+                 "use_case_alignment", "design_suitability", "content_compatibility"]
+}
+
+class JsonArrayScanner:
+    """
+    Incrementally scans streamed text and reports when the outermost JSON array
+    has been closed, ignoring brackets inside string literals.
+    """
+    
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str) -> bool:
+        """Consume a chunk of text; return True once the outer array is complete"""
+        for char in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == '[':
+                self.depth += 1
+                self.started = True
+            elif char == ']' and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+class SemanticSelectionCache:
+    """
+    Persistent two-tier cache of template selections, stored in SQLite.
+    
+    Tier 1 matches the exact (model, content, requirements, templates database) key.
+    Tier 2 embeds the user content and reuses a cached selection whose content
+    embedding is at least similarity_threshold cosine-similar, for the same
+    model, requirements and templates database.
+    
+    The connection is shared between threads (selectors are reused across calls),
+    so every statement runs under a lock. Methods raise sqlite3.Error on failure.
+    """
+    
+    EMBEDDING_MODEL = "models/text-embedding-004"
+    
+    def __init__(self, cache_path: str, model_name: str, similarity_threshold: float = 0.95, 
+                 ttl_seconds: float = 86400):
+        self.model_name = model_name
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(cache_path, check_same_thread=False)
+        try:
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(selections)")}
+            if columns and "model_name" not in columns:
+                # Entries written before the model was recorded can't be attributed to one
+                self.conn.execute("DROP TABLE selections")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS selections (
+                    key TEXT PRIMARY KEY,
+                    model_name TEXT NOT NULL,
+                    templates_hash TEXT NOT NULL,
+                    requirements TEXT NOT NULL,
+                    embedding BLOB,
+                    matches_json TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self.conn.commit()
+            self.evict_expired()
+        except sqlite3.Error:
+            self.conn.close()
+            raise
+    
+    def make_key(self, user_content: str, user_requirements: str, templates_hash: str) -> str:
+        """Exact-match cache key for a selection request"""
+        digest = hashlib.sha256()
+        for part in (self.model_name, templates_hash, user_requirements, user_content):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+    
+    def embed(self, user_content: str) -> Optional[array]:
+        """Embed user content for similarity lookups, or None if embedding fails"""
+        try:
+            result = genai.embed_content(model=self.EMBEDDING_MODEL, content=user_content)
+            return array('f', result['embedding'])
+        except Exception as e:
+            logger.warning(f"⚠️  Could not embed content for selection cache: {e}")
+            return None
+    
+    def get_exact(self, key: str) -> Optional[List[TemplateMatch]]:
+        """Return the cached selection stored under key, if still fresh"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT matches_json FROM selections WHERE key = ? AND created_at >= ?",
+                (key, time.time() - self.ttl_seconds)
+            ).fetchone()
+        return self._decode_matches(row[0]) if row else None
+    
+    def get_similar(self, embedding: array, user_requirements: str, 
+                    templates_hash: str) -> Optional[List[TemplateMatch]]:
+        """Return the most similar fresh cached selection above the similarity threshold"""
+        with self._lock:
+            rows = self.conn.execute(
+                """SELECT embedding, matches_json FROM selections
+                   WHERE model_name = ? AND templates_hash = ? AND requirements = ? 
+                   AND embedding IS NOT NULL AND created_at >= ?""",
+                (self.model_name, templates_hash, user_requirements, time.time() - self.ttl_seconds)
+            ).fetchall()
+        
+        best_score, best_matches_json = 0.0, None
+        for blob, matches_json in rows:
+            cached = array('f')
+            cached.frombytes(blob)
+            score = self._cosine_similarity(embedding, cached)
+            if score > best_score:
+                best_score, best_matches_json = score, matches_json
+        
+        if best_matches_json is not None and best_score >= self.similarity_threshold:
+            logger.info(f"♻️  Reusing cached selection for similar content (similarity: {best_score:.3f})")
+            return self._decode_matches(best_matches_json)
+        return None
+    
+    def put(self, key: str, user_requirements: str, templates_hash: str, 
+            embedding: Optional[array], matches: List[TemplateMatch]):
+        """Store a selection result"""
+        matches_json = json.dumps([_match_to_dict(match) for match in matches])
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO selections VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, self.model_name, templates_hash, user_requirements,
+                 embedding.tobytes() if embedding is not None else None,
+                 matches_json, time.time())
+            )
+            self.conn.commit()
+    
+    def evict_expired(self):
+        """Delete entries older than the cache TTL"""
+        with self._lock:
+            self.conn.execute("DELETE FROM selections WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            self.conn.commit()
+    
+    def close(self):
+        """Close the SQLite connection"""
+        with self._lock:
+            self.conn.close()
+    
+    @staticmethod
+    def _decode_matches(matches_json: str) -> List[TemplateMatch]:
+        return [TemplateMatch(**item) for item in json.loads(matches_json)]
+    
+    @staticmethod
+    def _cosine_similarity(a: array, b: array) -> float:
+        if len(a) != len(b):
+            return 0.0
+        dot = sum(x * y for x, y in zip(a, b))
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return dot / norm if norm else 0.0
+
 class DualTemplateSelector:
     """
     Intelligent template selector that finds the two best matching templates
     using Gemini AI analysis of user content and template characteristics.
     """
     
-    def __init__(self, api_key: str, model_name: str = "gemini-2.5-flash-preview-05-20"):
+    def __init__(self, api_key: str, model_name: str = "gemini-2.5-flash-preview-05-20", 
+                 cache_path: Optional[str] = None):
         self.api_key = api_key
         self.model_name = model_name
         self.templates_data = None
+        self.templates_hash = None
+        self._template_index = {}
+        self._templates_summary = None
+        self._template_summaries = []
+        self._template_term_freqs = []
+        self._template_lengths = []
+        self._term_idf = {}
+        
+        # Optional persistent cache of previous selections; selection works without it
+        self.cache = None
+        if cache_path:
+            try:
+                self.cache = SemanticSelectionCache(cache_path, model_name)
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️  Selection cache unavailable, continuing without it: {e}")
         
         # Initialize Gemini AI
         try:
             genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel(model_name)
-            print(f"✅ Initialized Gemini AI model: {model_name}")
+            # Structured output guarantees the response is a bare JSON array matching the schema
+            self.model = genai.GenerativeModel(
+                model_name,
+                generation_config=genai.GenerationConfig(
+                    response_mime_type="application/json",
+                    response_schema={"type": "array", "items": TEMPLATE_MATCH_SCHEMA}
+                )
+            )
+            logger.info(f"✅ Initialized Gemini AI model: {model_name}")
         except Exception as e:
-            print(f"❌ Failed to initialize Gemini AI: {e}")
+            logger.error(f"❌ Failed to initialize Gemini AI: {e}")
             raise
     
     def load_templates_database(self, templates_path: str) -> bool:
         """Load the Microsoft templates database"""
         try:
             if not os.path.exists(templates_path):
-                print(f"❌ Templates database not found: {templates_path}")
+                logger.error(f"❌ Templates database not found: {templates_path}")
                 return False
             
-            with open(templates_path, 'r', encoding='utf-8') as f:
-                self.templates_data = json.load(f)
+            with open(templates_path, 'rb') as f:
+                raw_data = f.read()
+            self.templates_data = json_loads(raw_data)
+            self.templates_hash = hashlib.sha256(raw_data).hexdigest()
+            self._template_index = {t['id']: t for t in self.templates_data.get('templates', [])}
+            
+            # The catalog doesn't change between requests, so summarize it once
+            self._templates_summary = self._prepare_templates_summary()
+            self._build_prefilter_index()
             
             total_templates = len(self.templates_data.get('templates', []))
-            print(f"📚 Loaded {total_templates} templates from database")
+            logger.info(f"📚 Loaded {total_templates} templates from database")
             return True
             
         except Exception as e:
-            print(f"❌ Error loading templates database: {e}")
+            logger.error(f"❌ Error loading templates database: {e}")
             return False
     
     def select_best_two_templates(self, user_content: str, user_requirements: str = "") -> List[TemplateMatch]:
@@ -72,73 +348,200 @@ class DualTemplateSelector:
             List of top 2 TemplateMatch objects
         """
         if not self.templates_data:
-            print("❌ Templates database not loaded")
+            logger.error("❌ Templates database not loaded")
             return []
         
+        # genai's API key is process-global and may have been set for another selector since
+        genai.configure(api_key=self.api_key)
+        
         try:
-            print("🧠 Analyzing user content and selecting best templates...")
+            # Reuse a cached selection for identical or near-identical content
+            cache_key = embedding = None
+            if self.cache:
+                cache_key = self.cache.make_key(user_content, user_requirements, self.templates_hash)
+                try:
+                    matches = self.cache.get_exact(cache_key)
+                    if matches is None:
+                        embedding = self.cache.embed(user_content)
+                        if embedding is not None:
+                            matches = self.cache.get_similar(embedding, user_requirements, self.templates_hash)
+                except sqlite3.Error as e:
+                    logger.warning(f"⚠️  Could not read selection cache: {e}")
+                    matches = None
+                if matches:
+                    logger.info(f"♻️  Using {len(matches)} cached template matches")
+                    return matches
             
-            # Prepare templates summary for AI analysis
-            templates_summary = self._prepare_templates_summary()
+            logger.info("🧠 Analyzing user content and selecting best templates...")
             
             # Create comprehensive prompt for dual template selection
+            templates_summary = self._summary_for_content(user_content, user_requirements)
             prompt = self._create_dual_selection_prompt(user_content, user_requirements, templates_summary)
             
             # Make AI request with retry logic
-            response = self._make_ai_request_with_retry(prompt)
-            if not response:
+            response_text = self._make_ai_request_with_retry(prompt)
+            if not response_text:
                 return []
             
             # Parse AI response to get top 2 recommendations
-            matches = self._parse_dual_ai_response(response.text)
+            matches = self._parse_dual_ai_response(response_text)
             
             if matches:
-                print(f"🎯 Successfully selected {len(matches)} template matches:")
-                for i, match in enumerate(matches, 1):
-                    print(f"   {i}. {match.template_title} (confidence: {match.confidence_score:.2f})")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("\n".join(
+                        [f"🎯 Successfully selected {len(matches)} template matches:"] +
+                        [f"   {i}. {match.template_title} (confidence: {match.confidence_score:.2f})"
+                         for i, match in enumerate(matches, 1)]
+                    ))
+                
+                if self.cache:
+                    try:
+                        self.cache.put(cache_key, user_requirements, self.templates_hash, embedding, matches)
+                    except sqlite3.Error as e:
+                        logger.warning(f"⚠️  Could not update selection cache: {e}")
                 return matches
             else:
-                print("❌ Failed to parse AI recommendations")
+                logger.error("❌ Failed to parse AI recommendations")
                 return []
                 
         except Exception as e:
-            print(f"❌ Error during template selection: {e}")
+            logger.error(f"❌ Error during template selection: {e}")
+            return []
+    
+    def select_best_two_templates_batch(self, items: Sequence[Tuple[str, str]], 
+                                        max_concurrent: int = 5) -> List[List[TemplateMatch]]:
+        """
+        Select the two best templates for several (user_content, user_requirements) pairs
+        
+        Requests are sent concurrently, at most max_concurrent at a time.
+        
+        Args:
+            items: Sequence of (user_content, user_requirements) tuples
+            max_concurrent: Maximum number of in-flight Gemini requests
+        
+        Returns:
+            List of TemplateMatch lists, in the same order as items
+        """
+        return asyncio.run(self.select_best_two_templates_batch_async(items, max_concurrent))
+    
+    async def select_best_two_templates_batch_async(self, items: Sequence[Tuple[str, str]], 
+                                                    max_concurrent: int = 5) -> List[List[TemplateMatch]]:
+        """Async variant of select_best_two_templates_batch for callers already running an event loop"""
+        if not self.templates_data:
+            logger.error("❌ Templates database not loaded")
+            return [[] for _ in items]
+        
+        genai.configure(api_key=self.api_key)
+        semaphore = asyncio.Semaphore(max_concurrent)
+        logger.info(f"🧠 Selecting templates for {len(items)} contents ({max_concurrent} concurrent requests)...")
+        
+        return await asyncio.gather(*[
+            self._select_best_two_templates_async(user_content, user_requirements, semaphore)
+            for user_content, user_requirements in items
+        ])
+    
+    async def _select_best_two_templates_async(self, user_content: str, user_requirements: str, 
+                                               semaphore: asyncio.Semaphore) -> List[TemplateMatch]:
+        """Select the two best templates for one content item without blocking the event loop"""
+        try:
+            templates_summary = self._summary_for_content(user_content, user_requirements)
+            prompt = self._create_dual_selection_prompt(user_content, user_requirements, templates_summary)
+            
+            response_text = await self._make_ai_request_with_retry_async(prompt, semaphore)
+            if not response_text:
+                return []
+            
+            return self._parse_dual_ai_response(response_text)
+            
+        except Exception as e:
+            logger.error(f"❌ Error during template selection: {e}")
             return []
     
     def _prepare_templates_summary(self) -> str:
         """Prepare a comprehensive summary of available templates for AI analysis"""
         templates = self.templates_data.get('templates', [])
         
-        summary_parts = []
+        self._template_summaries = []
         for template in templates:
             template_info = f"""
 Template ID: {template['id']}
 Title: {template['title']}
-Description: {template['description']}
+Description: {_clip(template['description'], SUMMARY_MAX_DESCRIPTION_CHARS)}
 Category: {template['category']}
 Theme: {template['theme']}
-Use Cases: {', '.join(template['use_cases'])}
+Use Cases: {', '.join(template['use_cases'][:SUMMARY_MAX_USE_CASES])}
 Color Scheme: {template['color_scheme']}
 """
-            summary_parts.append(template_info.strip())
+            self._template_summaries.append(template_info.strip())
+        
+        return '\n---\n'.join(self._template_summaries)
+    
+    def _build_prefilter_index(self):
+        """Build BM25 term statistics over template title, description, use cases and category"""
+        templates = self.templates_data.get('templates', [])
+        
+        self._template_term_freqs = []
+        self._template_lengths = []
+        document_freqs = Counter()
+        for template in templates:
+            document = ' '.join([
+                template.get('title', ''),
+                template.get('description', ''),
+                ' '.join(template.get('use_cases', [])),
+                template.get('category', '')
+            ])
+            term_freqs = Counter(_TOKEN_RE.findall(document.lower()))
+            self._template_term_freqs.append(term_freqs)
+            self._template_lengths.append(sum(term_freqs.values()))
+            document_freqs.update(term_freqs.keys())
         
-        return '\n---\n'.join(summary_parts)
+        total = len(templates)
+        self._term_idf = {
+            term: math.log(1 + (total - freq + 0.5) / (freq + 0.5))
+            for term, freq in document_freqs.items()
+        }
+    
+    def _summary_for_content(self, user_content: str, user_requirements: str) -> str:
+        """
+        Return the templates summary to send to Gemini for this request.
+        
+        Catalogs larger than PREFILTER_MIN_TEMPLATES are narrowed to the PREFILTER_TOP_K
+        templates that best match the user content by BM25 keyword score; Gemini still
+        makes the final choice.
+        """
+        if len(self._template_summaries) <= PREFILTER_MIN_TEMPLATES:
+            return self._templates_summary
+        
+        query_terms = set(_TOKEN_RE.findall(f"{user_content} {user_requirements}".lower()))
+        query_terms = [term for term in query_terms if term in self._term_idf]
+        if not query_terms:
+            return self._templates_summary
+        
+        avg_length = (sum(self._template_lengths) / len(self._template_lengths)) or 1
+        scores = []
+        for index, term_freqs in enumerate(self._template_term_freqs):
+            length_norm = BM25_K1 * (1 - BM25_B + BM25_B * self._template_lengths[index] / avg_length)
+            score = 0.0
+            for term in query_terms:
+                freq = term_freqs.get(term)
+                if freq:
+                    score += self._term_idf[term] * freq * (BM25_K1 + 1) / (freq + length_norm)
+            scores.append(score)
+        
+        # Keep catalog order among the candidates so the summary is deterministic
+        top_indices = sorted(sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:PREFILTER_TOP_K])
+        return '\n---\n'.join(self._template_summaries[index] for index in top_indices)
     
     def _create_dual_selection_prompt(self, user_content: str, user_requirements: str, templates_summary: str) -> str:
         """Create a comprehensive prompt for AI to select the two best templates"""
         
+        # Static instructions and the templates catalog come first and the per-request
+        # user input last, so repeated calls share a byte-identical prompt prefix that
+        # Gemini can serve from its prompt cache (a prefiltered catalog only shares the
+        # instructions, since its candidates depend on the user content)
         prompt = f"""
 You are an expert presentation designer with deep knowledge of visual communication, business presentations, and template selection. Your task is to analyze user content and select the TWO BEST matching PowerPoint templates from a database of Microsoft templates.
 
-USER CONTENT TO ANALYZE:
-{user_content}
-
-ADDITIONAL USER REQUIREMENTS:
-{user_requirements if user_requirements else "None specified"}
-
-AVAILABLE TEMPLATES:
-{templates_summary}
-
 SELECTION CRITERIA:
 Please evaluate each template based on these factors:
 1. **Content Compatibility** (0.0-1.0): How well the template structure suits the user's content type
@@ -168,98 +571,84 @@ ANALYSIS INSTRUCTIONS:
    - Design variety while maintaining quality
 
 OUTPUT FORMAT:
-Return EXACTLY this JSON structure with no additional text:
-
-[
-    {{
-        "template_id": "exact-template-id-from-database",
-        "template_title": "Template Name",
-        "confidence_score": 0.95,
-        "reasoning": "Detailed explanation of why this template is the best choice, including specific alignment with user content, use case match, and design appropriateness",
-        "matching_factors": {{
-            "content_compatibility": 0.9,
-            "use_case_alignment": 0.95,
-            "design_suitability": 0.85,
-            "layout_appropriateness": 0.9,
-            "professional_fit": 0.95
-        }},
-        "use_case_alignment": 0.95,
-        "design_suitability": 0.85,
-        "content_compatibility": 0.9
-    }},
-    {{
-        "template_id": "exact-template-id-from-database-2",
-        "template_title": "Second Template Name",
-        "confidence_score": 0.88,
-        "reasoning": "Detailed explanation of why this is the second-best choice, highlighting different strengths or complementary features",
-        "matching_factors": {{
-            "content_compatibility": 0.85,
-            "use_case_alignment": 0.9,
-            "design_suitability": 0.9,
-            "layout_appropriateness": 0.85,
-            "professional_fit": 0.9
-        }},
-        "use_case_alignment": 0.9,
-        "design_suitability": 0.9,
-        "content_compatibility": 0.85
-    }}
-]
+Return a JSON array with exactly two template selections, best match first. The response
+schema defines the fields; matching_factors scores each criterion above from 0.0 to 1.0.
 
 IMPORTANT:
-- Return ONLY the JSON array, no markdown formatting or additional text
 - Ensure template_id exactly matches the ID from the database
 - Confidence scores should reflect realistic assessment (typically 0.7-0.95)
 - Provide detailed, specific reasoning for each selection
 - Consider complementary strengths between the two selections
+
+AVAILABLE TEMPLATES:
+{templates_summary}
+
+USER CONTENT TO ANALYZE:
+{user_content}
+
+ADDITIONAL USER REQUIREMENTS:
+{user_requirements if user_requirements else "None specified"}
 """
         return prompt
     
-    def _make_ai_request_with_retry(self, prompt: str, max_retries: int = 3):
-        """Make AI request with retry logic"""
+    def _make_ai_request_with_retry(self, prompt: str, max_retries: int = 3) -> Optional[str]:
+        """Make a streamed AI request with retry logic and return the response text"""
         for attempt in range(max_retries):
             try:
-                response = self.model.generate_content(prompt)
-                return response
+                # Stop reading as soon as the JSON array closes; anything after it is discarded anyway
+                chunks = []
+                scanner = JsonArrayScanner()
+                for chunk in self.model.generate_content(prompt, stream=True):
+                    chunks.append(chunk.text)
+                    if scanner.feed(chunk.text):
+                        break
+                return "".join(chunks)
             except Exception as e:
-                print(f"⚠️  AI request attempt {attempt + 1} failed: {e}")
+                logger.warning(f"⚠️  AI request attempt {attempt + 1} failed: {e}")
                 if attempt == max_retries - 1:
-                    print(f"❌ AI request failed after {max_retries} attempts")
+                    logger.error(f"❌ AI request failed after {max_retries} attempts")
                     return None
                 
                 # Exponential backoff
                 wait_time = 2 ** attempt
-                print(f"🔄 Retrying in {wait_time} seconds...")
+                logger.info(f"🔄 Retrying in {wait_time} seconds...")
                 time.sleep(wait_time)
         
         return None
     
+    async def _make_ai_request_with_retry_async(self, prompt: str, semaphore: asyncio.Semaphore, 
+                                                max_retries: int = 3) -> Optional[str]:
+        """Make a streamed AI request with retry logic, holding a semaphore slot only while it is in flight"""
+        for attempt in range(max_retries):
+            try:
+                async with semaphore:
+                    chunks = []
+                    scanner = JsonArrayScanner()
+                    async for chunk in await self.model.generate_content_async(prompt, stream=True):
+                        chunks.append(chunk.text)
+                        if scanner.feed(chunk.text):
+                            break
+                    return "".join(chunks)
+            except Exception as e:
+                logger.warning(f"⚠️  AI request attempt {attempt + 1} failed: {e}")
+                if attempt == max_retries - 1:
+                    logger.error(f"❌ AI request failed after {max_retries} attempts")
+                    return None
+                
+                # Exponential backoff without blocking other requests
+                wait_time = 2 ** attempt
+                logger.info(f"🔄 Retrying in {wait_time} seconds...")
+                await asyncio.sleep(wait_time)
+        
+        return None
+    
     def _parse_dual_ai_response(self, response_text: str) -> List[TemplateMatch]:
         """Parse AI response to extract the two template recommendations"""
         try:
-            # Clean response text
-            response_text = response_text.strip()
-            
-            # Remove markdown formatting if present
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            
-            # Find JSON array boundaries
-            start_idx = response_text.find('[')
-            end_idx = response_text.rfind(']') + 1
-            
-            if start_idx == -1 or end_idx == 0:
-                print("❌ No JSON array found in AI response")
-                return []
-            
-            json_text = response_text[start_idx:end_idx]
-            data = json.loads(json_text)
+            data = json.loads(response_text)
             
             matches = []
-            for item in data:
+            for item in data[:2]:
                 match = TemplateMatch(
                     template_id=item["template_id"],
                     template_title=item["template_title"],
@@ -272,90 +661,119 @@ IMPORTANT:
                 )
                 matches.append(match)
             
-            return matches[:2]  # Ensure we only return top 2
+            return matches
             
         except json.JSONDecodeError as e:
-            print(f"❌ JSON parsing error: {e}")
-            print(f"Response text: {response_text}")
+            logger.error(f"❌ JSON parsing error: {e}")
+            logger.debug(f"Response text: {response_text}")
             return []
         except KeyError as e:
-            print(f"❌ Missing required field in AI response: {e}")
+            logger.error(f"❌ Missing required field in AI response: {e}")
             return []
         except Exception as e:
-            print(f"❌ Error parsing AI response: {e}")
+            logger.error(f"❌ Error parsing AI response: {e}")
             return []
     
     def get_template_details(self, template_id: str) -> Optional[Dict]:
         """Get full details of a specific template"""
-        if not self.templates_data:
-            return None
-        
-        for template in self.templates_data.get("templates", []):
-            if template["id"] == template_id:
-                return template
-        
-        return None
+        return self._template_index.get(template_id)
     
     def save_selections(self, matches: List[TemplateMatch], output_path: str):
         """Save the template selections to a JSON file"""
         try:
+            template_index = self._template_index
             selections_data = {
                 "selection_metadata": {
                     "total_templates_analyzed": len(self.templates_data.get("templates", [])),
                     "top_selections": len(matches),
                     "selection_timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
                 },
-                "selections": []
+                "selections": [
+                    {
+                        "rank": i,
+                        "match_details": _match_to_dict(match),
+                        "template_details": template_index.get(match.template_id)
+                    }
+                    for i, match in enumerate(matches, 1)
+                ]
             }
             
-            for i, match in enumerate(matches, 1):
-                selection = {
-                    "rank": i,
-                    "match_details": asdict(match),
-                    "template_details": self.get_template_details(match.template_id)
-                }
-                selections_data["selections"].append(selection)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(selections_data, f, indent=2, ensure_ascii=False)
+            with open(output_path, 'wb') as f:
+                f.write(json_dumps(selections_data, indent=True))
             
-            print(f"💾 Saved template selections to {output_path}")
+            logger.info(f"💾 Saved template selections to {output_path}")
             
         except Exception as e:
-            print(f"❌ Error saving selections: {e}")
+            logger.error(f"❌ Error saving selections: {e}")
+    
+    def close(self):
+        """Release the selection cache connection"""
+        if self.cache:
+            self.cache.close()
+            self.cache = None
     
     def display_results(self, matches: List[TemplateMatch]):
         """Display the selection results in a formatted way"""
         if not matches:
-            print("❌ No template matches found")
+            logger.error("❌ No template matches found")
             return
         
-        print("\n" + "="*80)
-        print("🎯 TEMPLATE SELECTION RESULTS")
-        print("="*80)
+        if not logger.isEnabledFor(logging.INFO):
+            return
         
+        # Emit the whole report as one log record
+        lines = ["\n" + "="*80, "🎯 TEMPLATE SELECTION RESULTS", "="*80]
         for i, match in enumerate(matches, 1):
-            print(f"\n🏆 RANK {i} - {match.template_title}")
-            print(f"   Template ID: {match.template_id}")
-            print(f"   Confidence Score: {match.confidence_score:.2f}")
-            print(f"   Content Compatibility: {match.content_compatibility:.2f}")
-            print(f"   Use Case Alignment: {match.use_case_alignment:.2f}")
-            print(f"   Design Suitability: {match.design_suitability:.2f}")
-            print(f"   Reasoning: {match.reasoning}")
+            lines.append(f"\n🏆 RANK {i} - {match.template_title}")
+            lines.append(f"   Template ID: {match.template_id}")
+            lines.append(f"   Confidence Score: {match.confidence_score:.2f}")
+            lines.append(f"   Content Compatibility: {match.content_compatibility:.2f}")
+            lines.append(f"   Use Case Alignment: {match.use_case_alignment:.2f}")
+            lines.append(f"   Design Suitability: {match.design_suitability:.2f}")
+            lines.append(f"   Reasoning: {match.reasoning}")
             
             # Get additional template details
             template_details = self.get_template_details(match.template_id)
             if template_details:
-                print(f"   Category: {template_details['category']}")
-                print(f"   Theme: {template_details['theme']}")
-                print(f"   Use Cases: {', '.join(template_details['use_cases'])}")
-                print(f"   Layout Types: {', '.join(template_details['layout_types'])}")
+                lines.append(f"   Category: {template_details['category']}")
+                lines.append(f"   Theme: {template_details['theme']}")
+                lines.append(f"   Use Cases: {', '.join(template_details['use_cases'])}")
+                lines.append(f"   Layout Types: {', '.join(template_details['layout_types'])}")
         
-        print("\n" + "="*80)
+        lines.append("\n" + "="*80)
+        logger.info("\n".join(lines))
+
+def _get_selector(api_key: str, model_name: str, templates_db_path: str, 
+                  cache_path: Optional[str]) -> Optional[DualTemplateSelector]:
+    """Return a loaded selector, reusing the cached one unless the templates database changed"""
+    try:
+        mtime = os.path.getmtime(templates_db_path)
+    except OSError:
+        mtime = None
+    
+    key = (hashlib.sha256(api_key.encode('utf-8')).hexdigest(), model_name, 
+           os.path.realpath(templates_db_path), cache_path)
+    cached = _SELECTOR_CACHE.get(key)
+    if cached and mtime is not None and cached[0] == mtime:
+        return cached[1]
+    
+    # The database changed (or can't be checked), so the old selector won't be used again
+    if cached:
+        _SELECTOR_CACHE.pop(key)
+        cached[1].close()
+    
+    selector = DualTemplateSelector(api_key, model_name, cache_path=cache_path)
+    if not selector.load_templates_database(templates_db_path):
+        selector.close()
+        return None
+    
+    _SELECTOR_CACHE[key] = (mtime, selector)
+    return selector
 
 def select_dual_templates(user_content: str, templates_db_path: str = None, user_requirements: str = "", 
                          api_key: str = None, model_name: str = "gemini-2.5-flash-preview-05-20", 
-                         verbose: bool = True, save_results: bool = True) -> List[TemplateMatch]:
+                         verbose: bool = True, save_results: bool = True, 
+                         use_cache: bool = False) -> List[TemplateMatch]:
     """
     Main function to select the two best matching templates
     
@@ -367,6 +785,9 @@ def select_dual_templates(user_content: str, templates_db_path: str = None, user
         model_name: Gemini model name (optional)
         verbose: Whether to display detailed output (default: True)
         save_results: Whether to save results to JSON file (default: True)
+        use_cache: Whether to reuse selections cached next to the templates database (default: False).
+            A cache miss costs an extra embedding request, and content that is merely similar
+            to an earlier request gets that request's selection.
     
     Returns:
         List of top 2 TemplateMatch objects
@@ -374,7 +795,7 @@ def select_dual_templates(user_content: str, templates_db_path: str = None, user
     
     # Validate user content
     if not user_content or not user_content.strip():
-        print("❌ User content is required and cannot be empty.")
+        logger.error("❌ User content is required and cannot be empty.")
         return []
     
     # Set default templates database path if not provided
@@ -386,18 +807,19 @@ def select_dual_templates(user_content: str, templates_db_path: str = None, user
         api_key = os.getenv("GOOGLE_API_KEY")
     
     if not api_key:
-        print("❌ Google API key not provided. Please set GOOGLE_API_KEY environment variable.")
+        logger.error("❌ Google API key not provided. Please set GOOGLE_API_KEY environment variable.")
         return []
     
     if verbose:
-        print("🚀 Starting Intelligent Dual Template Selection...")
-        print(f"📄 Analyzing user content ({len(user_content)} characters)")
-    
-    # Initialize selector
-    selector = DualTemplateSelector(api_key, model_name)
+        logger.info("🚀 Starting Intelligent Dual Template Selection...")
+        logger.info(f"📄 Analyzing user content ({len(user_content)} characters)")
     
-    # Load templates database
-    if not selector.load_templates_database(templates_db_path):
+    # Initialize selector and load templates database (reused while the database is unchanged)
+    cache_path = None
+    if use_cache:
+        cache_path = os.path.join(os.path.dirname(templates_db_path), "dual_template_selection_cache.sqlite")
+    selector = _get_selector(api_key, model_name, templates_db_path, cache_path)
+    if not selector:
         return []
     
     # Select best two templates
@@ -414,10 +836,9 @@ def select_dual_templates(user_content: str, templates_db_path: str = None, user
             selector.save_selections(matches, output_path)
         
         if verbose:
-            print("✅ Dual template selection completed successfully!")
+            logger.info("✅ Dual template selection completed successfully!")
     else:
-        if verbose:
-            print("❌ Dual template selection failed!")
+        logger.error("❌ Dual template selection failed!")
     
     return matches
 
@@ -441,7 +862,7 @@ def select_templates_for_content(content: str, requirements: str = "", **kwargs)
 
 def main():
     """Main function with command line argument support"""
-    import sys
+    setup_console_logging()
     
     # Check if user content is provided as command line argument
     if len(sys.argv) > 1:
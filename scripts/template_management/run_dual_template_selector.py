@@ -22,10 +22,11 @@ from pathlib import Path
 scripts_dir = Path(__file__).parent
 sys.path.insert(0, str(scripts_dir))
 
-from .intelligent_template_selector_dual import select_dual_templates
+from .intelligent_template_selector_dual import select_dual_templates, setup_console_logging
 
 def main():
     """Main function to run dual template selection"""
+    setup_console_logging()
     
     print("🎯 Intelligent Dual Template Selector")
     print("=" * 50)
@@ -27,7 +27,8 @@ sys.path.insert(0, str(scripts_dir))
 
 # Import our modules
 try:
-    from .intelligent_template_selector_dual import select_dual_templates, TemplateMatch
+    from .intelligent_template_selector_dual import select_dual_templates
+    from .intelligent_template_selector_dual import setup_console_logging as setup_selector_logging
     SELECTOR_AVAILABLE = True
 except ImportError:
     SELECTOR_AVAILABLE = False
@@ -35,17 +36,26 @@ except ImportError:
 
 try:
     from .simple_template_downloader import SimpleTemplateDownloader
+    from .simple_template_downloader import setup_console_logging as setup_downloader_logging
     SIMPLE_DOWNLOADER_AVAILABLE = True
 except ImportError:
     SIMPLE_DOWNLOADER_AVAILABLE = False
     print("⚠️  Simple downloader not available")
 
-try:
-    from .template_downloader import MicrosoftTemplateDownloader
-    SELENIUM_DOWNLOADER_AVAILABLE = True
-except ImportError:
-    SELENIUM_DOWNLOADER_AVAILABLE = False
-    print("⚠️  Selenium downloader not available")
+# The Selenium downloader is slow to import and only used with --use-selenium, so it
+# is loaded on first use; the flag flips to False if its import fails
+SELENIUM_DOWNLOADER_AVAILABLE = True
+
+def _import_selenium_downloader():
+    """Import the Selenium-based downloader on first use"""
+    global SELENIUM_DOWNLOADER_AVAILABLE
+    try:
+        from .template_downloader import MicrosoftTemplateDownloader
+    except ImportError:
+        SELENIUM_DOWNLOADER_AVAILABLE = False
+        print("⚠️  Selenium downloader not available")
+        return None
+    return MicrosoftTemplateDownloader
 
 def get_user_content_interactive() -> str:
     """Get user content through interactive input"""
@@ -152,7 +162,11 @@ def download_templates(selections_file: str, output_dir: str, use_selenium: bool
     print(f"Output directory: {output_dir}")
     
     try:
+        MicrosoftTemplateDownloader = None
         if use_selenium and SELENIUM_DOWNLOADER_AVAILABLE:
+            MicrosoftTemplateDownloader = _import_selenium_downloader()
+        
+        if MicrosoftTemplateDownloader is not None:
             print("🔧 Using Selenium-based downloader (headless mode)")
             downloader = MicrosoftTemplateDownloader(output_dir=output_dir, headless=True)
             templates = downloader.load_template_selections(selections_file)
@@ -253,6 +267,12 @@ Examples:
     
     args = parser.parse_args()
     
+    # Show selection and download progress as plain console lines
+    if SELECTOR_AVAILABLE:
+        setup_selector_logging()
+    if SIMPLE_DOWNLOADER_AVAILABLE:
+        setup_downloader_logging()
+    
     print("🚀 AI-Powered Template Selection & Download")
     print("=" * 60)
     
@@ -11,16 +11,263 @@ Usage:
     python simple_template_downloader.py --selections-file custom_selections.json
 """
 
+import asyncio
+import hashlib
+import io
 import json
+import logging
 import os
 import requests
+import sys
+import tempfile
+import threading
 import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict, Optional
 from dataclasses import dataclass
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import argparse
 
-@dataclass
+try:
+    from .file_utils import json_dumps, json_loads, safe_title
+except ImportError:  # Run as a standalone script from this directory
+    from file_utils import json_dumps, json_loads, safe_title
+
+# aiohttp is optional; it enables the --async download path
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# httpx is optional; with its http2 extra, requests share multiplexed HTTP/2 connections
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# ijson is optional; when present the selections file is stream-parsed
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+def setup_console_logging(level: int = logging.INFO):
+    """Print this module's log messages as-is on stdout, like the CLI output they replace"""
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+
+# Maximum concurrent requests against a single host
+MAX_REQUESTS_PER_HOST = 4
+
+# Overall request rate limit (token bucket)
+REQUESTS_PER_SECOND = 4.0
+REQUEST_BURST = 8
+
+# Common Microsoft Create download URL patterns
+DOWNLOAD_URL_PATTERNS = (
+    "https://create.microsoft.com/api/template/{template_id}/download",
+    "https://create.microsoft.com/en-us/template/{template_id}/download",
+    "https://create.microsoft.com/download/{template_id}",
+    "https://templates.office.com/en-us/templates/{template_id}",
+)
+
+# Per-user cache directory for state kept between runs, outside the project tree
+USER_CACHE_DIR = Path.home() / ".cache" / "junior"
+
+# Remembers which URL pattern worked, keyed by host
+URL_PATTERN_CACHE_FILE = USER_CACHE_DIR / "url_pattern_cache.json"
+
+# Content hashes of completed downloads, one index per downloads directory, keyed by template ID
+CACHE_INDEX_DIR = USER_CACHE_DIR / "download_index"
+
+# Static report blocks, formatted once
+_MANUAL_INSTRUCTIONS_HEADER = (
+    "\n🔧 MANUAL DOWNLOAD INSTRUCTIONS\n"
+    + "=" * 50 + "\n"
+    "The following templates could not be downloaded automatically.\n"
+    "Please download them manually from the Microsoft Create website:\n"
+    "\n"
+)
+_MANUAL_INSTRUCTIONS_FOOTER = (
+    "Instructions:\n"
+    "1. Visit each URL in your browser\n"
+    "2. Click the 'Download' button\n"
+    "3. Save the file with the specified filename\n"
+    "4. Place the file in the specified location\n"
+)
+_REPORT_HEADER = "=" * 60 + "\n📊 SIMPLE TEMPLATE DOWNLOAD REPORT\n" + "=" * 60 + "\n"
+_REPORT_FOOTER = "=" * 60 + "\n🎯 Download process completed!\n" + "=" * 60
+
+# Content types served for PowerPoint files
+PPTX_CONTENT_TYPES = (
+    'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+    'application/vnd.ms-powerpoint',
+)
+
+# Generic binary content types also used for downloads; the zip signature check
+# on the streamed body decides whether they really are PowerPoint files
+BINARY_CONTENT_TYPES = (
+    'application/octet-stream',
+    'binary/octet-stream',
+    'application/zip',
+    'application/x-zip-compressed',
+)
+
+# .pptx files are zip archives
+ZIP_MAGIC = b'PK\x03\x04'
+
+# Downloads are streamed to disk in chunks and aborted past a sanity cap
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+MAX_DOWNLOAD_BYTES = 200 * 1024 * 1024
+WRITE_BATCH_SIZE = 16 * DOWNLOAD_CHUNK_SIZE
+
+def _may_be_pptx_download(content_type: str, url: str) -> bool:
+    """Check a probe response's content type and final URL for a possible PowerPoint download"""
+    content_type = content_type.lower()
+    return (any(pptx_type in content_type for pptx_type in PPTX_CONTENT_TYPES) or
+            any(binary_type in content_type for binary_type in BINARY_CONTENT_TYPES) or
+            url.lower().endswith('.pptx'))
+
+class _TokenBucket:
+    """Thread-safe token bucket; callers wait only when the bucket is empty"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+    
+    def acquire(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def acquire_async(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class _TempFileWriter:
+    """
+    Writes a streamed download to a temporary file in the downloads directory.
+    
+    Chunks are queued and flushed with one os.writev call per batch on the raw
+    file descriptor, skipping Python's buffered I/O layer.
+    """
+    
+    def __init__(self, directory: Path):
+        fd, name = tempfile.mkstemp(dir=directory, suffix='.part')
+        self.fd: Optional[int] = fd
+        self.path = Path(name)
+        self.bytes_written = 0
+        self.header = b''
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+    
+    def write(self, chunk: bytes) -> bool:
+        """Queue a chunk; returns False once the data can't be a .pptx file"""
+        # .pptx files are zip archives; stop as soon as the signature doesn't match
+        if len(self.header) < len(ZIP_MAGIC):
+            self.header += chunk[:len(ZIP_MAGIC) - len(self.header)]
+            if not ZIP_MAGIC.startswith(self.header):
+                return False
+        
+        self.bytes_written += len(chunk)
+        if self.bytes_written > MAX_DOWNLOAD_BYTES:
+            raise ValueError(f"download exceeds {MAX_DOWNLOAD_BYTES} bytes")
+        
+        self._pending.append(chunk)
+        self._pending_size += len(chunk)
+        if self._pending_size >= WRITE_BATCH_SIZE:
+            self._flush()
+        return True
+    
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        
+        written = os.writev(self.fd, self._pending) if hasattr(os, 'writev') else 0
+        if written < self._pending_size:
+            # Short vector write (or no writev on this platform): write the rest directly
+            remainder = memoryview(b''.join(self._pending))[written:]
+            while remainder:
+                remainder = remainder[os.write(self.fd, remainder):]
+        
+        self._pending = []
+        self._pending_size = 0
+    
+    def commit(self, min_size: int) -> Optional[Path]:
+        """
+        Finish the file and validate it
+        
+        Args:
+            min_size: Minimum number of bytes for the download to be kept
+            
+        Returns:
+            Path of the temporary file, or None if the download was rejected
+        """
+        try:
+            self._flush()
+            valid = self.header == ZIP_MAGIC and self.bytes_written >= min_size
+            if valid:
+                os.fsync(self.fd)
+        except Exception:
+            self.discard()
+            raise
+        
+        os.close(self.fd)
+        self.fd = None
+        
+        # Remove small/invalid file
+        if not valid or not zipfile.is_zipfile(self.path):
+            self.path.unlink()
+            return None
+        
+        return self.path
+    
+    def discard(self) -> None:
+        """Close and delete the temporary file"""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        if self.path.exists():
+            self.path.unlink()
+
+def _file_digest(path: Path) -> str:
+    """Hash a file's contents; blake2b is fast and plenty for duplicate detection"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# slots=True needs Python 3.10; a hand-written __slots__ would clash with the field default
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**DATACLASS_SLOTS)
 class SimpleTemplateInfo:
     """Simple template information for downloading"""
     template_id: str
@@ -34,8 +281,9 @@ class SimpleTemplateDownloader:
     Simple template downloader using requests and known URL patterns.
     """
     
-    def __init__(self, output_dir: str = "./template"):
+    def __init__(self, output_dir: str = "./template", max_workers: int = 8):
         self.output_dir = Path(output_dir)
+        self.max_workers = max_workers
         self.output_dir.mkdir(exist_ok=True)
         
         # Create downloads subdirectory
@@ -48,46 +296,281 @@ class SimpleTemplateDownloader:
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
         
-        print(f"📁 Downloads will be saved to: {self.downloads_dir}")
+        # Keep enough pooled connections for concurrent downloads and retry transient failures
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16,
+                              max_retries=Retry(total=2, backoff_factor=0.3))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Prefer HTTP/2 when httpx and h2 are installed
+        self._http2_client = None
+        if HTTPX_AVAILABLE:
+            try:
+                transport = httpx.HTTPTransport(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+                    retries=2
+                )
+                self._http2_client = httpx.Client(transport=transport, headers=dict(self.session.headers), timeout=30.0)
+            except ImportError:
+                logger.warning("⚠️  h2 not installed, using HTTP/1.1 requests session")
+        
+        # Per-host concurrency limits, replacing the fixed delay between downloads
+        self._host_semaphores: Dict[str, threading.Semaphore] = {}
+        self._host_semaphores_lock = threading.Lock()
+        
+        # Overall request rate cap that still lets bursts of probes through
+        self._rate_limiter = _TokenBucket(rate=REQUESTS_PER_SECOND, capacity=REQUEST_BURST)
+        
+        # Snapshot of files in the downloads directory, refreshed per download run
+        self._existing_files: set = set()
+        self._existing_files_lock = threading.Lock()
+        
+        # Hashes of previous downloads, so a renamed template is not fetched again
+        downloads_dir_key = hashlib.sha256(str(self.downloads_dir.resolve()).encode('utf-8')).hexdigest()[:16]
+        self._cache_index_file = CACHE_INDEX_DIR / f"{downloads_dir_key}.json"
+        self._cache_index = self._load_cache_index()
+        self._cache_index_lock = threading.Lock()
+        
+        # URL pattern that last produced a download, tried first for later templates
+        self._pattern_cache_file = URL_PATTERN_CACHE_FILE
+        self._pattern_cache = self._load_pattern_cache()
+        self._pattern_cache_lock = threading.Lock()
+        self._working_pattern: Optional[str] = next(iter(self._pattern_cache.values()), None)
+        
+        logger.info(f"📁 Downloads will be saved to: {self.downloads_dir}")
+    
+    def _load_pattern_cache(self) -> Dict[str, str]:
+        """Load URL patterns that worked in previous runs"""
+        try:
+            with open(self._pattern_cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        # Ignore patterns that are no longer known
+        return {host: pattern for host, pattern in cache.items() if pattern in DOWNLOAD_URL_PATTERNS}
+    
+    def _remember_working_pattern(self, pattern: str) -> None:
+        """Record a URL pattern that produced a download and persist it"""
+        with self._pattern_cache_lock:
+            self._working_pattern = pattern
+            host = urlparse(pattern).netloc
+            if self._pattern_cache.get(host) == pattern:
+                return
+            self._pattern_cache[host] = pattern
+            
+            try:
+                self._pattern_cache_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(self._pattern_cache_file, 'w', encoding='utf-8') as f:
+                    json.dump(self._pattern_cache, f, indent=2)
+            except OSError as e:
+                logger.warning(f"⚠️  Could not save URL pattern cache: {e}")
     
     def load_template_selections(self, selections_file: str) -> List[SimpleTemplateInfo]:
         """Load template selections from JSON file"""
         try:
             if not os.path.exists(selections_file):
-                print(f"❌ Selections file not found: {selections_file}")
+                logger.error(f"❌ Selections file not found: {selections_file}")
                 return []
             
-            with open(selections_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
             templates = []
-            for selection in data.get('selections', []):
-                template_details = selection.get('template_details', {})
-                template_id = template_details.get('id', '')
-                template_title = template_details.get('title', 'Unknown Template')
-                preview_url = template_details.get('preview_url', '')
+            with open(selections_file, 'rb') as f:
+                if IJSON_AVAILABLE:
+                    # Yield one selection at a time instead of loading the whole document
+                    selections = ijson.items(f, 'selections.item')
+                else:
+                    data = json_loads(f.read())
+                    selections = data.get('selections', [])
                 
-                if template_id:
-                    # Create safe filename
-                    safe_title = "".join(c for c in template_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                    safe_title = safe_title.replace(' ', '_')
-                    filename = f"{safe_title}_{template_id[:8]}.pptx"
+                for selection in selections:
+                    template_details = selection.get('template_details', {})
+                    template_id = template_details.get('id', '')
+                    template_title = template_details.get('title', 'Unknown Template')
+                    preview_url = template_details.get('preview_url', '')
                     
-                    template_info = SimpleTemplateInfo(
-                        template_id=template_id,
-                        template_title=template_title,
-                        preview_url=preview_url,
-                        local_filename=filename
-                    )
-                    templates.append(template_info)
+                    if template_id:
+                        # Create safe filename
+                        filename = f"{safe_title(template_title)}_{template_id[:8]}.pptx"
+                        
+                        template_info = SimpleTemplateInfo(
+                            template_id=template_id,
+                            template_title=template_title,
+                            preview_url=preview_url,
+                            local_filename=filename
+                        )
+                        templates.append(template_info)
             
-            print(f"📋 Loaded {len(templates)} templates for download")
+            logger.info(f"📋 Loaded {len(templates)} templates for download")
             return templates
             
         except Exception as e:
-            print(f"❌ Error loading template selections: {e}")
+            logger.error(f"❌ Error loading template selections: {e}")
             return []
     
+    def _scan_existing_files(self) -> None:
+        """Snapshot the downloads directory with a single scan"""
+        with os.scandir(self.downloads_dir) as entries:
+            existing = {entry.name for entry in entries if entry.is_file()}
+        with self._existing_files_lock:
+            self._existing_files = existing
+    
+    def _is_downloaded(self, filename: str) -> bool:
+        """Check the directory snapshot for an already downloaded file"""
+        with self._existing_files_lock:
+            return filename in self._existing_files
+    
+    def _commit_download(self, temp_path: Path, target_file: Path, template_id: str) -> None:
+        """Move a validated download into place and record it in the snapshot and hash index"""
+        digest = _file_digest(temp_path)
+        size = temp_path.stat().st_size
+        os.replace(temp_path, target_file)
+        
+        with self._existing_files_lock:
+            self._existing_files.add(target_file.name)
+        with self._cache_index_lock:
+            self._cache_index[template_id] = {"hash": digest, "path": target_file.name, "size": size}
+    
+    def _load_cache_index(self) -> Dict[str, Dict]:
+        """Load the hash index of previous downloads"""
+        try:
+            with open(self._cache_index_file, 'rb') as f:
+                return json_loads(f.read())
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_cache_index(self) -> None:
+        """Persist the hash index of completed downloads"""
+        with self._cache_index_lock:
+            raw_data = json_dumps(self._cache_index)
+        
+        try:
+            self._cache_index_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._cache_index_file, 'wb') as f:
+                f.write(raw_data)
+        except OSError as e:
+            logger.warning(f"⚠️  Could not save download cache index: {e}")
+    
+    def _find_cached_download(self, template_info: SimpleTemplateInfo) -> Optional[str]:
+        """Return the filename of an intact earlier download of the same template, if any"""
+        with self._cache_index_lock:
+            entry = self._cache_index.get(template_info.template_id)
+        if not entry:
+            return None
+        
+        cached_file = self.downloads_dir / entry["path"]
+        try:
+            if cached_file.stat().st_size != entry["size"]:
+                return None
+        except OSError:
+            return None
+        
+        return entry["path"] if _file_digest(cached_file) == entry["hash"] else None
+    
+    def _skip_if_downloaded(self, template_info: SimpleTemplateInfo) -> bool:
+        """Mark a template completed if it is already on disk, under its own or an earlier filename"""
+        # Check if file already exists
+        target_file = self.downloads_dir / template_info.local_filename
+        if self._is_downloaded(template_info.local_filename):
+            logger.info(f"✅ Template already exists, skipping: {target_file}")
+            template_info.download_status = "completed"
+            return True
+        
+        # The title may have changed since the template was downloaded
+        cached_filename = self._find_cached_download(template_info)
+        if cached_filename:
+            logger.info(f"✅ Identical template already downloaded, skipping: {cached_filename}")
+            template_info.local_filename = cached_filename
+            template_info.download_status = "completed"
+            return True
+        
+        return False
+    
+    def _request(self, method: str, url: str, **kwargs):
+        """
+        Issue a request, limiting concurrent requests per host
+        
+        Takes requests-style keyword arguments and returns either a requests or an
+        httpx response; use _iter_body to read streamed bodies from either.
+        """
+        host = urlparse(url).netloc
+        with self._host_semaphores_lock:
+            semaphore = self._host_semaphores.setdefault(host, threading.Semaphore(MAX_REQUESTS_PER_HOST))
+        
+        self._rate_limiter.acquire()
+        with semaphore:
+            if self._http2_client is not None:
+                request = self._http2_client.build_request(method, url, headers=kwargs.get('headers'),
+                                                           timeout=kwargs.get('timeout', 30.0))
+                return self._http2_client.send(request, stream=kwargs.get('stream', False),
+                                               follow_redirects=kwargs.get('allow_redirects', True))
+            return self.session.request(method, url, **kwargs)
+    
+    def _iter_body(self, response, chunk_size: int):
+        """Iterate over a streamed response body from either HTTP client"""
+        if HTTPX_AVAILABLE and isinstance(response, httpx.Response):
+            return response.iter_bytes(chunk_size)
+        return response.iter_content(chunk_size=chunk_size)
+    
+    def _probe_download_url(self, url: str) -> bool:
+        """
+        Check whether a URL serves a PowerPoint file without fetching the whole body
+        
+        Args:
+            url: Candidate download URL
+            
+        Returns:
+            True if the URL may serve a PowerPoint download (the body is checked for
+            the zip signature when it is streamed)
+        """
+        response = self._request('HEAD', url, timeout=10, allow_redirects=True)
+        
+        if response.status_code == 200:
+            return _may_be_pptx_download(response.headers.get('content-type', ''), str(response.url))
+        
+        if response.status_code not in (405, 501):
+            return False
+        
+        # Server rejects HEAD: fetch the first bytes and look for the zip signature
+        response = self._request('GET', url, timeout=10, allow_redirects=True, stream=True,
+                                 headers={'Range': 'bytes=0-4095'})
+        try:
+            if response.status_code not in (200, 206):
+                return False
+            first_chunk = next(iter(self._iter_body(response, 4096)), b'')
+            return first_chunk.startswith(ZIP_MAGIC)
+        finally:
+            response.close()
+    
+    def _stream_to_temp_file(self, response, min_size: int,
+                             stop: Optional[threading.Event] = None) -> Optional[Path]:
+        """
+        Stream a response body into a temporary file in the downloads directory
+        
+        Args:
+            response: Response opened with stream=True
+            min_size: Minimum number of bytes for the download to be kept
+            stop: Abandons the download as soon as it is set
+            
+        Returns:
+            Path of the temporary file, or None if the download was rejected
+        """
+        writer = _TempFileWriter(self.downloads_dir)
+        try:
+            for chunk in self._iter_body(response, DOWNLOAD_CHUNK_SIZE):
+                if stop is not None and stop.is_set():
+                    writer.discard()
+                    return None
+                if not writer.write(chunk):
+                    break
+        except Exception:
+            writer.discard()
+            raise
+        finally:
+            response.close()
+        
+        return writer.commit(min_size)
+    
     def try_direct_download(self, template_info: SimpleTemplateInfo) -> bool:
         """
         Try to download template using known URL patterns
@@ -98,49 +581,87 @@ class SimpleTemplateDownloader:
         Returns:
             True if download was successful
         """
-        # Common Microsoft Create download URL patterns
-        download_url_patterns = [
-            f"https://create.microsoft.com/api/template/{template_info.template_id}/download",
-            f"https://create.microsoft.com/en-us/template/{template_info.template_id}/download",
-            f"https://create.microsoft.com/download/{template_info.template_id}",
-            f"https://templates.office.com/en-us/templates/{template_info.template_id}",
-        ]
-        
         target_file = self.downloads_dir / template_info.local_filename
         
-        for url_pattern in download_url_patterns:
+        # URL patterns are probed concurrently; the first valid download wins
+        found = threading.Event()
+        write_lock = threading.Lock()
+        
+        def probe(pattern: str) -> bool:
+            if found.is_set():
+                return False
+            
+            url_pattern = pattern.format(template_id=template_info.template_id)
             try:
-                print(f"🔄 Trying download URL: {url_pattern}")
-                response = self.session.get(url_pattern, timeout=30, allow_redirects=True)
+                logger.debug("🔄 Trying download URL: %s", url_pattern)
+                
+                # Skip dead endpoints and HTML pages before downloading anything
+                if not self._probe_download_url(url_pattern) or found.is_set():
+                    return False
+                
+                response = self._request('GET', url_pattern, timeout=30, allow_redirects=True, stream=True)
+                if response.status_code != 200:
+                    response.close()
+                    return False
+                
+                # Verify file size is reasonable (at least 5KB); stop early if another pattern wins
+                temp_path = self._stream_to_temp_file(response, 5001, stop=found)
+                if temp_path is None:
+                    return False
                 
-                # Check if response contains PowerPoint data
-                if response.status_code == 200:
-                    content_type = response.headers.get('content-type', '').lower()
+                with write_lock:
+                    if found.is_set():
+                        temp_path.unlink()
+                        return False
                     
-                    # Check for PowerPoint content
-                    if ('application/vnd.openxmlformats-officedocument.presentationml.presentation' in content_type or
-                        'application/vnd.ms-powerpoint' in content_type or
-                        '.pptx' in response.url.lower() or
-                        len(response.content) > 10000):  # Assume files > 10KB might be valid
-                        
-                        # Save the file
-                        with open(target_file, 'wb') as f:
-                            f.write(response.content)
-                        
-                        # Verify file size is reasonable
-                        if target_file.stat().st_size > 5000:  # At least 5KB
-                            print(f"✅ Successfully downloaded: {template_info.template_title}")
-                            template_info.download_status = "completed"
-                            return True
-                        else:
-                            target_file.unlink()  # Remove small/invalid file
+                    # Save the file
+                    self._commit_download(temp_path, target_file, template_info.template_id)
+                    found.set()
+                    return True
                 
             except Exception as e:
-                print(f"⚠️  Failed to download from {url_pattern}: {e}")
-                continue
+                logger.debug("⚠️  Failed to download from %s: %s", url_pattern, e)
+            
+            return False
+        
+        # Try the pattern that worked for a previous template before probing all of them
+        working_pattern = self._working_pattern
+        if working_pattern and probe(working_pattern):
+            logger.info(f"✅ Successfully downloaded: {template_info.template_title}")
+            template_info.download_status = "completed"
+            return True
+        
+        remaining_patterns = [pattern for pattern in DOWNLOAD_URL_PATTERNS if pattern != working_pattern]
+        probe_pool = ThreadPoolExecutor(max_workers=len(remaining_patterns))
+        futures = {probe_pool.submit(probe, pattern): pattern for pattern in remaining_patterns}
+        try:
+            for future in as_completed(futures):
+                if future.result():
+                    self._remember_working_pattern(futures[future])
+                    logger.info(f"✅ Successfully downloaded: {template_info.template_title}")
+                    template_info.download_status = "completed"
+                    return True
+        finally:
+            # Losing probes see `found` and abandon their downloads; don't wait for them to notice
+            for future in futures:
+                future.cancel()
+            probe_pool.shutdown(wait=False)
         
         return False
     
+    def _preview_download_url(self, template_info: SimpleTemplateInfo) -> Optional[str]:
+        """Construct a download URL from the preview URL pattern, if possible"""
+        if not template_info.preview_url:
+            return None
+        
+        # Extract base URL and try to construct download URL
+        base_parts = template_info.preview_url.split('/')
+        if len(base_parts) < 7:
+            return None
+        
+        base_url = '/'.join(base_parts[:7])  # Keep protocol + domain + path parts
+        return f"{base_url}/download"
+    
     def download_via_preview_url(self, template_info: SimpleTemplateInfo) -> bool:
         """
         Try to find download link by analyzing preview URL structure
@@ -151,35 +672,30 @@ class SimpleTemplateDownloader:
         Returns:
             True if download was successful
         """
-        if not template_info.preview_url:
+        download_url = self._preview_download_url(template_info)
+        if not download_url:
             return False
         
         try:
-            # Extract base URL and try to construct download URL
-            base_parts = template_info.preview_url.split('/')
-            if len(base_parts) >= 7:
-                # Try to construct download URL from preview URL pattern
-                base_url = '/'.join(base_parts[:7])  # Keep protocol + domain + path parts
-                download_url = f"{base_url}/download"
-                
-                print(f"🔄 Trying constructed download URL: {download_url}")
-                response = self.session.get(download_url, timeout=30, allow_redirects=True)
+            logger.debug("🔄 Trying constructed download URL: %s", download_url)
+            response = self._request('GET', download_url, timeout=30, allow_redirects=True, stream=True)
+            
+            content_length = int(response.headers.get('content-length') or 0)
+            if response.status_code != 200 or 0 < content_length <= 10000:
+                response.close()
+                return False
+            
+            temp_path = self._stream_to_temp_file(response, 10001)
+            if temp_path is not None:
+                target_file = self.downloads_dir / template_info.local_filename
+                self._commit_download(temp_path, target_file, template_info.template_id)
                 
-                if response.status_code == 200 and len(response.content) > 10000:
-                    target_file = self.downloads_dir / template_info.local_filename
-                    
-                    with open(target_file, 'wb') as f:
-                        f.write(response.content)
-                    
-                    if target_file.stat().st_size > 5000:
-                        print(f"✅ Successfully downloaded via preview URL: {template_info.template_title}")
-                        template_info.download_status = "completed"
-                        return True
-                    else:
-                        target_file.unlink()
+                logger.info(f"✅ Successfully downloaded via preview URL: {template_info.template_title}")
+                template_info.download_status = "completed"
+                return True
         
         except Exception as e:
-            print(f"⚠️  Failed to download via preview URL: {e}")
+            logger.warning(f"⚠️  Failed to download via preview URL: {e}")
         
         return False
     
@@ -190,35 +706,20 @@ class SimpleTemplateDownloader:
         if not failed_templates:
             return ""
         
-        instructions = [
-            "",
-            "🔧 MANUAL DOWNLOAD INSTRUCTIONS",
-            "="*50,
-            "The following templates could not be downloaded automatically.",
-            "Please download them manually from the Microsoft Create website:",
-            ""
-        ]
+        buf = io.StringIO()
+        buf.write(_MANUAL_INSTRUCTIONS_HEADER)
         
         for template_info in failed_templates:
-            template_url = f"https://create.microsoft.com/en-us/template/{template_info.template_id}"
-            instructions.extend([
-                f"📄 {template_info.template_title}",
-                f"   URL: {template_url}",
-                f"   Save as: {template_info.local_filename}",
-                f"   Location: {self.downloads_dir}",
-                ""
-            ])
-        
-        instructions.extend([
-            "Instructions:",
-            "1. Visit each URL in your browser",
-            "2. Click the 'Download' button",
-            "3. Save the file with the specified filename",
-            "4. Place the file in the specified location",
-            ""
-        ])
-        
-        return "\n".join(instructions)
+            buf.write(
+                f"📄 {template_info.template_title}\n"
+                f"   URL: https://create.microsoft.com/en-us/template/{template_info.template_id}\n"
+                f"   Save as: {template_info.local_filename}\n"
+                f"   Location: {self.downloads_dir}\n"
+                "\n"
+            )
+        
+        buf.write(_MANUAL_INSTRUCTIONS_FOOTER)
+        return buf.getvalue()
     
     def download_templates(self, templates: List[SimpleTemplateInfo]) -> Dict[str, int]:
         """
@@ -231,80 +732,239 @@ class SimpleTemplateDownloader:
             Dictionary with download statistics
         """
         if not templates:
-            print("❌ No templates to download")
+            logger.error("❌ No templates to download")
             return {"total": 0, "completed": 0, "failed": 0}
         
         stats = {"total": len(templates), "completed": 0, "failed": 0}
+        self._scan_existing_files()
         
-        for i, template_info in enumerate(templates, 1):
-            print(f"\n📥 Processing template {i}/{len(templates)}: {template_info.template_title}")
+        # Templates are downloaded concurrently; per-host limits keep the load on Microsoft reasonable
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = pool.map(self._download_template, templates, range(1, len(templates) + 1))
+            for success in results:
+                if success:
+                    stats["completed"] += 1
+                else:
+                    stats["failed"] += 1
+        
+        self._save_cache_index()
+        return stats
+    
+    def _download_template(self, template_info: SimpleTemplateInfo, position: int) -> bool:
+        """Download a single template, trying each download method in turn"""
+        logger.info(f"📥 Processing template {position}: {template_info.template_title}")
+        
+        if self._skip_if_downloaded(template_info):
+            return True
+        
+        # Method 1: Try direct download URLs
+        # Method 2: Try via preview URL
+        if self.try_direct_download(template_info) or self.download_via_preview_url(template_info):
+            return True
+        
+        logger.error(f"❌ Failed to download: {template_info.template_title}")
+        template_info.download_status = "failed"
+        return False
+    
+    async def adownload_templates(self, templates: List[SimpleTemplateInfo]) -> Dict[str, int]:
+        """
+        Download all selected templates on a single event loop using aiohttp
+        
+        Args:
+            templates: List of template information objects
             
-            # Check if file already exists
-            target_file = self.downloads_dir / template_info.local_filename
-            if target_file.exists():
-                print(f"✅ Template already exists, skipping: {target_file}")
-                template_info.download_status = "completed"
-                stats["completed"] += 1
-                continue
+        Returns:
+            Dictionary with download statistics
+        """
+        if not AIOHTTP_AVAILABLE:
+            logger.warning("⚠️  aiohttp not installed, falling back to threaded downloads")
+            return self.download_templates(templates)
+        
+        if not templates:
+            logger.error("❌ No templates to download")
+            return {"total": 0, "completed": 0, "failed": 0}
+        
+        self._scan_existing_files()
+        
+        connector = aiohttp.TCPConnector(limit=16, limit_per_host=MAX_REQUESTS_PER_HOST, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers=dict(self.session.headers)) as session:
+            results = await asyncio.gather(*(
+                self._adownload_template(session, template_info, i)
+                for i, template_info in enumerate(templates, 1)
+            ))
+        
+        self._save_cache_index()
+        completed = sum(1 for success in results if success)
+        return {"total": len(templates), "completed": completed, "failed": len(templates) - completed}
+    
+    async def _adownload_template(self, session: "aiohttp.ClientSession",
+                                  template_info: SimpleTemplateInfo, position: int) -> bool:
+        """Async counterpart of _download_template"""
+        logger.info(f"📥 Processing template {position}: {template_info.template_title}")
+        
+        if self._skip_if_downloaded(template_info):
+            return True
+        
+        if (await self._atry_direct_download(session, template_info) or
+                await self._adownload_via_preview_url(session, template_info)):
+            return True
+        
+        logger.error(f"❌ Failed to download: {template_info.template_title}")
+        template_info.download_status = "failed"
+        return False
+    
+    async def _astream_to_temp_file(self, response: "aiohttp.ClientResponse", min_size: int) -> Optional[Path]:
+        """Async counterpart of _stream_to_temp_file"""
+        writer = _TempFileWriter(self.downloads_dir)
+        try:
+            async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                if not writer.write(chunk):
+                    break
+        except BaseException:
+            # Also covers cancellation when a sibling probe wins
+            writer.discard()
+            raise
+        
+        return writer.commit(min_size)
+    
+    async def _aprobe_download_url(self, session: "aiohttp.ClientSession", url: str) -> bool:
+        """Async counterpart of _probe_download_url"""
+        await self._rate_limiter.acquire_async()
+        async with session.head(url, allow_redirects=True) as response:
+            if response.status == 200:
+                return _may_be_pptx_download(response.headers.get('content-type', ''), str(response.url))
             
-            # Try different download methods
-            success = False
+            if response.status not in (405, 501):
+                return False
+        
+        # Server rejects HEAD: fetch the first bytes and look for the zip signature
+        await self._rate_limiter.acquire_async()
+        async with session.get(url, allow_redirects=True, headers={'Range': 'bytes=0-4095'}) as response:
+            if response.status not in (200, 206):
+                return False
+            first_chunk = await response.content.read(4096)
+            return first_chunk.startswith(ZIP_MAGIC)
+    
+    async def _atry_direct_download(self, session: "aiohttp.ClientSession",
+                                    template_info: SimpleTemplateInfo) -> bool:
+        """Async counterpart of try_direct_download; pending probes are cancelled on the first success"""
+        target_file = self.downloads_dir / template_info.local_filename
+        found = asyncio.Event()
+        
+        async def probe(pattern: str) -> bool:
+            url_pattern = pattern.format(template_id=template_info.template_id)
+            try:
+                logger.debug("🔄 Trying download URL: %s", url_pattern)
+                if not await self._aprobe_download_url(session, url_pattern):
+                    return False
+                
+                await self._rate_limiter.acquire_async()
+                async with session.get(url_pattern, allow_redirects=True) as response:
+                    if response.status != 200:
+                        return False
+                    temp_path = await self._astream_to_temp_file(response, 5001)
+                
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug("⚠️  Failed to download from %s: %s", url_pattern, e)
+                return False
             
-            # Method 1: Try direct download URLs
-            if self.try_direct_download(template_info):
-                success = True
-            # Method 2: Try via preview URL
-            elif self.download_via_preview_url(template_info):
-                success = True
+            if temp_path is None:
+                return False
+            if found.is_set():
+                temp_path.unlink()
+                return False
             
-            if success:
-                stats["completed"] += 1
-            else:
-                print(f"❌ Failed to download: {template_info.template_title}")
-                template_info.download_status = "failed"
-                stats["failed"] += 1
+            self._commit_download(temp_path, target_file, template_info.template_id)
+            found.set()
+            return True
+        
+        # Try the pattern that worked for a previous template before probing all of them
+        working_pattern = self._working_pattern
+        if working_pattern and await probe(working_pattern):
+            logger.info(f"✅ Successfully downloaded: {template_info.template_title}")
+            template_info.download_status = "completed"
+            return True
+        
+        tasks = {asyncio.ensure_future(probe(pattern)): pattern
+                 for pattern in DOWNLOAD_URL_PATTERNS if pattern != working_pattern}
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.result():
+                    for other in pending:
+                        other.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    self._remember_working_pattern(tasks[task])
+                    logger.info(f"✅ Successfully downloaded: {template_info.template_title}")
+                    template_info.download_status = "completed"
+                    return True
+        
+        return False
+    
+    async def _adownload_via_preview_url(self, session: "aiohttp.ClientSession",
+                                         template_info: SimpleTemplateInfo) -> bool:
+        """Async counterpart of download_via_preview_url"""
+        download_url = self._preview_download_url(template_info)
+        if not download_url:
+            return False
+        
+        try:
+            logger.debug("🔄 Trying constructed download URL: %s", download_url)
+            await self._rate_limiter.acquire_async()
+            async with session.get(download_url, allow_redirects=True) as response:
+                if response.status != 200 or 0 < (response.content_length or 0) <= 10000:
+                    return False
+                temp_path = await self._astream_to_temp_file(response, 10001)
             
-            # Small delay between downloads
-            time.sleep(1)
+            if temp_path is not None:
+                target_file = self.downloads_dir / template_info.local_filename
+                self._commit_download(temp_path, target_file, template_info.template_id)
+                
+                logger.info(f"✅ Successfully downloaded via preview URL: {template_info.template_title}")
+                template_info.download_status = "completed"
+                return True
         
-        return stats
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to download via preview URL: {e}")
+        
+        return False
     
     def generate_download_report(self, templates: List[SimpleTemplateInfo], stats: Dict[str, int]) -> str:
         """Generate a download report"""
-        report_lines = [
-            "="*60,
-            "📊 SIMPLE TEMPLATE DOWNLOAD REPORT",
-            "="*60,
-            f"Total templates: {stats['total']}",
-            f"✅ Successfully downloaded: {stats['completed']}",
-            f"❌ Failed downloads: {stats['failed']}",
-            f"📁 Download directory: {self.downloads_dir}",
-            "",
-            "📋 DETAILED RESULTS:",
-            "-"*40
-        ]
+        buf = io.StringIO()
+        buf.write(_REPORT_HEADER)
+        buf.write(
+            f"Total templates: {stats['total']}\n"
+            f"✅ Successfully downloaded: {stats['completed']}\n"
+            f"❌ Failed downloads: {stats['failed']}\n"
+            f"📁 Download directory: {self.downloads_dir}\n"
+            "\n"
+            "📋 DETAILED RESULTS:\n"
+            + "-" * 40 + "\n"
+        )
         
         for template_info in templates:
-            status_emoji = "✅" if template_info.download_status == "completed" else "❌"
-            report_lines.append(f"{status_emoji} {template_info.template_title}")
-            report_lines.append(f"   ID: {template_info.template_id}")
-            report_lines.append(f"   Status: {template_info.download_status}")
-            if template_info.download_status == "completed":
-                report_lines.append(f"   File: {template_info.local_filename}")
-            report_lines.append("")
+            completed = template_info.download_status == "completed"
+            file_line = f"   File: {template_info.local_filename}\n" if completed else ""
+            buf.write(
+                f"{'✅' if completed else '❌'} {template_info.template_title}\n"
+                f"   ID: {template_info.template_id}\n"
+                f"   Status: {template_info.download_status}\n"
+                f"{file_line}\n"
+            )
         
         # Add manual download instructions if needed
         manual_instructions = self.generate_manual_download_instructions(templates)
         if manual_instructions:
-            report_lines.append(manual_instructions)
-        
-        report_lines.extend([
-            "="*60,
-            "🎯 Download process completed!",
-            "="*60
-        ])
+            buf.write(manual_instructions + "\n")
         
-        return "\n".join(report_lines)
+        buf.write(_REPORT_FOOTER)
+        return buf.getvalue()
 
 def main():
     """Main function with command line argument support"""
@@ -319,8 +979,20 @@ def main():
         default="./template",
         help="Directory to save downloaded templates"
     )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Download on a single asyncio event loop (requires aiohttp)"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Also show every download URL that is tried"
+    )
     
     args = parser.parse_args()
+    setup_console_logging(logging.DEBUG if args.verbose else logging.INFO)
     
     print("🚀 Simple Microsoft Template Downloader")
     print("=" * 50)
@@ -343,7 +1015,10 @@ def main():
         
         # Download templates
         print("\n🔄 Starting download process...")
-        stats = downloader.download_templates(templates)
+        if args.use_async:
+            stats = asyncio.run(downloader.adownload_templates(templates))
+        else:
+            stats = downloader.download_templates(templates)
         
         # Generate and display report
         report = downloader.generate_download_report(templates, stats)
@@ -8,7 +8,8 @@ It reads template IDs from dual_template_selections.json and downloads the actua
 from Microsoft Create.
 
 Requirements:
-    - selenium: For web automation
+    - aiohttp: For concurrent direct downloads (optional)
+    - selenium: For web automation (fallback)
     - webdriver-manager: For automatic driver management
     - requests: For HTTP requests
     - beautifulsoup4: For HTML parsing
@@ -19,11 +20,19 @@ Usage:
     python template_downloader.py --output-dir custom_template_folder
 """
 
+import asyncio
+import html
 import json
 import os
+import re
+import shutil
 import time
 import requests
+from requests.adapters import HTTPAdapter
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict, Optional
 from urllib.parse import urljoin, urlparse
@@ -45,9 +54,21 @@ except ImportError:
     SELENIUM_AVAILABLE = False
     print("⚠️  Selenium not available. Install with: pip install selenium webdriver-manager")
 
+try:
+    from .file_utils import load_json_file, safe_title
+except ImportError:  # Run as a standalone script from this directory
+    from file_utils import load_json_file, safe_title
+
+# aiohttp for concurrent direct downloads without a browser
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
 # BeautifulSoup for HTML parsing
 try:
-    from bs4 import BeautifulSoup
+    from bs4 import BeautifulSoup, SoupStrainer
     BS4_AVAILABLE = True
 except ImportError:
     BS4_AVAILABLE = False
@@ -57,6 +78,96 @@ except ImportError:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# watchdog lets downloads be detected from filesystem events instead of polling
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+# fcntl is POSIX-only; without it the ChromeDriver cache is simply not locked
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# Concurrent direct downloads
+MAX_CONCURRENT_DOWNLOADS = 8
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# First .pptx href in a page, matched on the raw response bytes
+_PPTX_HREF_RE = re.compile(rb'href\s*=\s*["\']([^"\']+\.pptx[^"\']*)["\']', re.IGNORECASE)
+
+# Resolved ChromeDriver path, cached so ChromeDriverManager doesn't hit the network every run
+CHROMEDRIVER_CACHE_FILE = Path.home() / ".cache" / "junior" / "chromedriver.json"
+CHROMEDRIVER_CACHE_MAX_AGE = 7 * 24 * 3600
+_chromedriver_path: Optional[str] = None
+_chromedriver_path_lock = threading.Lock()
+
+def get_chromedriver_path() -> str:
+    """
+    Return the ChromeDriver path, installing it only when the cached path is missing or stale
+    
+    Returns:
+        Path to the ChromeDriver executable
+    """
+    global _chromedriver_path
+    with _chromedriver_path_lock:
+        if _chromedriver_path and Path(_chromedriver_path).exists():
+            return _chromedriver_path
+        
+        CHROMEDRIVER_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = CHROMEDRIVER_CACHE_FILE.with_suffix('.lock')
+        with open(lock_file, 'w') as lock:
+            # Serialize installs across processes too
+            if FCNTL_AVAILABLE:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            
+            try:
+                with open(CHROMEDRIVER_CACHE_FILE, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+                if (Path(cached['path']).exists() and
+                        time.time() - cached['mtime'] < CHROMEDRIVER_CACHE_MAX_AGE):
+                    _chromedriver_path = cached['path']
+                    return _chromedriver_path
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+            
+            driver_path = ChromeDriverManager().install()
+            
+            temp_file = CHROMEDRIVER_CACHE_FILE.with_suffix('.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump({'path': driver_path, 'mtime': time.time()}, f)
+            os.replace(temp_file, CHROMEDRIVER_CACHE_FILE)
+            
+            _chromedriver_path = driver_path
+            return driver_path
+
+if WATCHDOG_AVAILABLE:
+    class _PptxDownloadHandler(FileSystemEventHandler):
+        """Routes finished .pptx downloads to the queue of the worker directory they land in"""
+        
+        def __init__(self, queues: Dict[str, "queue.Queue"]):
+            super().__init__()
+            self.queues = queues
+        
+        def _handle(self, path: str):
+            if path.endswith('.pptx'):
+                download_queue = self.queues.get(str(Path(path).parent))
+                if download_queue is not None:
+                    download_queue.put(Path(path))
+        
+        def on_created(self, event):
+            if not event.is_directory:
+                self._handle(event.src_path)
+        
+        def on_moved(self, event):
+            # Chrome renames .crdownload files once the download finishes
+            if not event.is_directory:
+                self._handle(event.dest_path)
+
 @dataclass
 class TemplateDownloadInfo:
     """Information about a template to download"""
@@ -73,12 +184,69 @@ class MicrosoftTemplateDownloader:
     Uses Selenium to automate the download process from the Microsoft Create website.
     """
     
-    def __init__(self, output_dir: str = "./template", headless: bool = True, timeout: int = 30):
+    # Download link/button selectors, combined so each lookup is one WebDriver round-trip
+    _DOWNLOAD_LINK_SELECTOR = ", ".join([
+        "a[href*='download']",
+        "button[aria-label*='Download']",
+        "a[download]",
+        ".download-button",
+        ".btn-download",
+        "[data-action='download']",
+        "a[href*='.pptx']",
+        "a[href*='powerpoint']"
+    ])
+    _DOWNLOAD_BUTTON_SELECTOR = ", ".join([
+        "button[aria-label*='Download']",
+        "a[download]",
+        ".download-button",
+        ".btn-download",
+        "[data-action='download']"
+    ])
+    
+    # Filters run inside the browser so links are inspected without a round-trip per element
+    _FIND_DOWNLOAD_HREF_SCRIPT = """
+        const links = [...document.querySelectorAll(arguments[0])].map(x => x.href).filter(Boolean);
+        const match = links.find(h => h.toLowerCase().includes('.pptx') || h.toLowerCase().includes('download'));
+        if (match) return match;
+        const pptx = [...document.querySelectorAll('a[href]')].find(x => x.href.toLowerCase().includes('.pptx'));
+        return pptx ? pptx.href : null;
+    """
+    _CLICK_DOWNLOAD_TEXT_SCRIPT = """
+        const els = document.evaluate(
+            "//*[contains(text(), 'Download') or contains(@aria-label, 'Download')]",
+            document, null, XPathResult.ORDERED_NODE_ITERATOR_TYPE, null);
+        let n;
+        while ((n = els.iterateNext())) {
+            const cs = getComputedStyle(n);
+            if (cs.display !== 'none' && cs.visibility !== 'hidden' && !n.disabled) {
+                n.click();
+                return true;
+            }
+        }
+        return false;
+    """
+    
+    def __init__(self, output_dir: str = "./template", headless: bool = True, timeout: int = 30,
+                 max_workers: int = 4):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.headless = headless
         self.timeout = timeout
-        self.driver = None
+        self.max_workers = max_workers
+        
+        # One WebDriver per worker thread; all of them are registered for cleanup
+        self._local = threading.local()
+        self._drivers = []
+        self._drivers_lock = threading.Lock()
+        
+        # Shared HTTP session for files whose URL is found on the page, created on first use
+        self._session = None
+        self._session_lock = threading.Lock()
+        
+        # Filesystem watcher for finished downloads, one queue per worker directory
+        self._observer = None
+        self._download_queues: Dict[str, queue.Queue] = {}
+        
         self.base_url = "https://create.microsoft.com/en-us/template/"
         
         # Create downloads subdirectory
@@ -87,6 +255,36 @@ class MicrosoftTemplateDownloader:
         
         logger.info(f"Initialized downloader with output directory: {self.output_dir}")
     
+    @property
+    def driver(self):
+        """WebDriver belonging to the current thread"""
+        return getattr(self._local, 'driver', None)
+    
+    @driver.setter
+    def driver(self, value):
+        self._local.driver = value
+    
+    @property
+    def session(self) -> requests.Session:
+        """Keep-alive HTTP session shared by all workers"""
+        with self._session_lock:
+            if self._session is None:
+                self._session = requests.Session()
+                self._session.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+                self._session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=8))
+            return self._session
+    
+    @property
+    def worker_downloads_dir(self) -> Path:
+        """Browser download directory for the current thread, so workers don't see each other's files"""
+        worker_dir = getattr(self._local, 'downloads_dir', None)
+        if worker_dir is None:
+            worker_dir = self.downloads_dir / f"w{threading.get_ident()}"
+            worker_dir.mkdir(exist_ok=True)
+            self._download_queues[str(worker_dir)] = queue.Queue()
+            self._local.downloads_dir = worker_dir
+        return worker_dir
+    
     def setup_driver(self) -> bool:
         """Setup Chrome WebDriver with appropriate options"""
         if not SELENIUM_AVAILABLE:
@@ -101,10 +299,13 @@ class MicrosoftTemplateDownloader:
             
             # Configure download preferences
             download_prefs = {
-                "download.default_directory": str(self.downloads_dir.absolute()),
+                "download.default_directory": str(self.worker_downloads_dir.absolute()),
                 "download.prompt_for_download": False,
                 "download.directory_upgrade": True,
-                "safebrowsing.enabled": True
+                "safebrowsing.enabled": True,
+                # Images and notifications aren't needed to find a download link
+                "profile.managed_default_content_settings.images": 2,
+                "profile.default_content_setting_values.notifications": 2
             }
             chrome_options.add_experimental_option("prefs", download_prefs)
             
@@ -113,12 +314,27 @@ class MicrosoftTemplateDownloader:
             chrome_options.add_argument("--disable-dev-shm-usage")
             chrome_options.add_argument("--disable-gpu")
             chrome_options.add_argument("--window-size=1920,1080")
+            
+            # Skip work that doesn't help locate the download
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            chrome_options.add_argument("--disable-extensions")
+            chrome_options.add_argument("--disable-background-networking")
+            chrome_options.add_argument("--disable-default-apps")
+            chrome_options.add_argument("--disable-sync")
+            chrome_options.add_argument("--metrics-recording-only")
+            chrome_options.add_argument("--mute-audio")
+            chrome_options.add_argument("--disable-features=TranslateUI")
+            
+            # Return from driver.get once the HTML is parsed; the waits below target the download controls
+            chrome_options.set_capability("pageLoadStrategy", "eager")
             chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
             
             # Setup driver with automatic driver management
-            service = Service(ChromeDriverManager().install())
+            service = Service(get_chromedriver_path())
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
             self.driver.set_page_load_timeout(self.timeout)
+            with self._drivers_lock:
+                self._drivers.append(self.driver)
             
             logger.info("Chrome WebDriver setup completed successfully")
             return True
@@ -134,8 +350,7 @@ class MicrosoftTemplateDownloader:
                 logger.error(f"Selections file not found: {selections_file}")
                 return []
             
-            with open(selections_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_json_file(selections_file)
             
             templates = []
             for selection in data.get('selections', []):
@@ -145,9 +360,7 @@ class MicrosoftTemplateDownloader:
                 
                 if template_id:
                     # Create safe filename
-                    safe_title = "".join(c for c in template_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                    safe_title = safe_title.replace(' ', '_')
-                    filename = f"{safe_title}_{template_id[:8]}.pptx"
+                    filename = f"{safe_title(template_title)}_{template_id[:8]}.pptx"
                     
                     template_info = TemplateDownloadInfo(
                         template_id=template_id,
@@ -163,6 +376,25 @@ class MicrosoftTemplateDownloader:
             logger.error(f"Error loading template selections: {e}")
             return []
     
+    def _wait_for_download_elements(self):
+        """Wait until the page has rendered a download link, button or label"""
+        WebDriverWait(self.driver, self.timeout).until(EC.any_of(
+            EC.presence_of_element_located((By.CSS_SELECTOR, self._DOWNLOAD_LINK_SELECTOR)),
+            EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Download')]"))
+        ))
+    
+    def _open_template_page(self, template_url: str):
+        """Load a template page in this thread's browser unless it is already showing"""
+        if getattr(self._local, 'page_url', None) == template_url:
+            return
+        
+        self._local.page_url = None
+        self.driver.get(template_url)
+        
+        # Wait for the download controls rather than just <body>
+        self._wait_for_download_elements()
+        self._local.page_url = template_url
+    
     def get_download_url(self, template_id: str) -> Optional[str]:
         """
         Navigate to template page and extract download URL
@@ -181,50 +413,15 @@ class MicrosoftTemplateDownloader:
             template_url = f"{self.base_url}{template_id}"
             logger.info(f"Navigating to: {template_url}")
             
-            self.driver.get(template_url)
-            
-            # Wait for page to load
-            WebDriverWait(self.driver, self.timeout).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # Look for download button or link
-            download_selectors = [
-                "a[href*='download']",
-                "button[aria-label*='Download']",
-                "a[download]",
-                ".download-button",
-                ".btn-download",
-                "[data-action='download']",
-                "a[href*='.pptx']",
-                "a[href*='powerpoint']"
-            ]
+            self._open_template_page(template_url)
             
+            # Look for download button or link, then any PowerPoint-related link
             download_url = None
-            for selector in download_selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        href = element.get_attribute('href')
-                        if href and ('.pptx' in href.lower() or 'download' in href.lower()):
-                            download_url = href
-                            break
-                    if download_url:
-                        break
-                except:
-                    continue
-            
-            # Alternative: Look for any PowerPoint-related links
-            if not download_url:
-                try:
-                    links = self.driver.find_elements(By.TAG_NAME, "a")
-                    for link in links:
-                        href = link.get_attribute('href')
-                        if href and '.pptx' in href.lower():
-                            download_url = href
-                            break
-                except:
-                    pass
+            try:
+                download_url = self.driver.execute_script(self._FIND_DOWNLOAD_HREF_SCRIPT,
+                                                          self._DOWNLOAD_LINK_SELECTOR)
+            except:
+                pass
             
             if download_url:
                 logger.info(f"Found download URL: {download_url}")
@@ -259,50 +456,32 @@ class MicrosoftTemplateDownloader:
             logger.info(f"Downloading template: {template_info.template_title}")
             logger.info(f"Template URL: {template_url}")
             
-            self.driver.get(template_url)
-            
-            # Wait for page to load
-            WebDriverWait(self.driver, self.timeout).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            self._open_template_page(template_url)
             
             # Look for and click download button
-            download_selectors = [
-                "button[aria-label*='Download']",
-                "a[download]",
-                ".download-button",
-                ".btn-download",
-                "[data-action='download']",
-                "button:contains('Download')",
-                "a:contains('Download')"
-            ]
-            
             download_clicked = False
-            for selector in download_selectors:
-                try:
-                    # Try to find and click download element
-                    wait = WebDriverWait(self.driver, 5)
-                    element = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-                    element.click()
-                    download_clicked = True
-                    logger.info(f"Successfully clicked download button: {selector}")
-                    break
-                except:
-                    continue
+            try:
+                # Wait for any download element, then click it via JS to skip the visibility round-trip
+                wait = WebDriverWait(self.driver, 5)
+                elements = wait.until(lambda d: d.find_elements(By.CSS_SELECTOR, self._DOWNLOAD_BUTTON_SELECTOR))
+                self.driver.execute_script("arguments[0].click()", elements[0])
+                download_clicked = True
+                logger.info("Successfully clicked download button")
+            except:
+                pass
             
             # Alternative: Look for any clickable download elements
             if not download_clicked:
                 try:
-                    elements = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Download') or contains(@aria-label, 'Download')]")
-                    for element in elements:
-                        if element.is_enabled() and element.is_displayed():
-                            element.click()
-                            download_clicked = True
-                            logger.info("Successfully clicked download element via text search")
-                            break
+                    if self.driver.execute_script(self._CLICK_DOWNLOAD_TEXT_SCRIPT):
+                        download_clicked = True
+                        logger.info("Successfully clicked download element via text search")
                 except:
                     pass
             
+            # The click may navigate away from the template page
+            self._local.page_url = None
+            
             if download_clicked:
                 # Wait a bit for download to start
                 time.sleep(3)
@@ -331,33 +510,22 @@ class MicrosoftTemplateDownloader:
         """
         logger.info(f"Waiting for download completion: {template_info.template_title}")
         
+        if self._observer is not None:
+            return self._wait_for_download_event(template_info, max_wait)
+        
         start_time = time.time()
         while time.time() - start_time < max_wait:
-            # Check for downloaded files
-            download_files = list(self.downloads_dir.glob("*.pptx"))
-            temp_files = list(self.downloads_dir.glob("*.crdownload")) + list(self.downloads_dir.glob("*.tmp"))
+            # Check for downloaded files in a single directory pass
+            with os.scandir(self.worker_downloads_dir) as it:
+                entries = [entry for entry in it if entry.is_file()]
+            download_files = [entry for entry in entries if entry.name.endswith('.pptx')]
+            temp_files = any(entry.name.endswith(('.crdownload', '.tmp')) for entry in entries)
             
             # If we have .pptx files and no temporary files, download is likely complete
             if download_files and not temp_files:
-                # Find the most recent file
-                latest_file = max(download_files, key=lambda f: f.stat().st_mtime)
-                
-                # Rename to our desired filename
-                target_path = self.downloads_dir / template_info.local_filename
-                
-                try:
-                    if target_path.exists():
-                        target_path.unlink()  # Remove existing file
-                    
-                    latest_file.rename(target_path)
-                    template_info.download_status = "completed"
-                    logger.info(f"Download completed: {target_path}")
-                    return True
-                    
-                except Exception as e:
-                    logger.error(f"Error renaming downloaded file: {e}")
-                    template_info.download_status = "failed"
-                    return False
+                # Find the most recent file (DirEntry caches its stat result)
+                latest_file = max(download_files, key=lambda entry: entry.stat().st_mtime)
+                return self._finish_download(Path(latest_file.path), template_info)
             
             time.sleep(2)
         
@@ -365,6 +533,57 @@ class MicrosoftTemplateDownloader:
         template_info.download_status = "failed"
         return False
     
+    def _wait_for_download_event(self, template_info: TemplateDownloadInfo, max_wait: int) -> bool:
+        """Block until the watcher reports a finished .pptx in this worker's directory"""
+        download_queue = self._download_queues[str(self.worker_downloads_dir)]
+        deadline = time.time() + max_wait
+        
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                downloaded_file = download_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            
+            # Skip events for files that were already moved away
+            if downloaded_file.exists():
+                return self._finish_download(downloaded_file, template_info)
+        
+        logger.warning(f"Download timeout for template: {template_info.template_title}")
+        template_info.download_status = "failed"
+        return False
+    
+    def _finish_download(self, downloaded_file: Path, template_info: TemplateDownloadInfo) -> bool:
+        """Rename a finished download to the template's filename"""
+        target_path = self.downloads_dir / template_info.local_filename
+        
+        try:
+            # Atomically overwrites any existing file
+            os.replace(downloaded_file, target_path)
+            template_info.download_status = "completed"
+            logger.info(f"Download completed: {target_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error renaming downloaded file: {e}")
+            template_info.download_status = "failed"
+            return False
+    
+    def _start_download_watcher(self):
+        """Start watching the downloads directory for finished files"""
+        if not WATCHDOG_AVAILABLE or self._observer is not None:
+            return
+        
+        try:
+            observer = Observer()
+            observer.schedule(_PptxDownloadHandler(self._download_queues), str(self.downloads_dir), recursive=True)
+            observer.start()
+            self._observer = observer
+        except Exception as e:
+            logger.warning(f"Could not start download watcher, falling back to polling: {e}")
+    
     def download_templates(self, templates: List[TemplateDownloadInfo]) -> Dict[str, int]:
         """
         Download all selected templates
@@ -379,86 +598,264 @@ class MicrosoftTemplateDownloader:
             logger.warning("No templates to download")
             return {"total": 0, "completed": 0, "failed": 0}
         
-        # Setup web driver
-        if not self.setup_driver():
+        stats = {"total": len(templates), "completed": 0, "failed": 0}
+        
+        # Skip templates that already exist before starting any browser
+        pending = []
+        for template_info in templates:
+            target_file = self.downloads_dir / template_info.local_filename
+            if target_file.exists():
+                logger.info(f"Template already exists, skipping: {target_file}")
+                template_info.download_status = "completed"
+                stats["completed"] += 1
+            else:
+                pending.append(template_info)
+        
+        if not pending:
+            return stats
+        
+        if not SELENIUM_AVAILABLE:
             logger.error("Failed to setup web driver")
-            return {"total": len(templates), "completed": 0, "failed": len(templates)}
+            stats["failed"] += len(pending)
+            return stats
         
-        stats = {"total": len(templates), "completed": 0, "failed": 0}
+        self._start_download_watcher()
         
+        # Each worker thread drives its own browser
         try:
-            for i, template_info in enumerate(templates, 1):
-                logger.info(f"Processing template {i}/{len(templates)}: {template_info.template_title}")
-                
-                # Check if file already exists
-                target_file = self.downloads_dir / template_info.local_filename
-                if target_file.exists():
-                    logger.info(f"Template already exists, skipping: {target_file}")
-                    template_info.download_status = "completed"
-                    stats["completed"] += 1
-                    continue
-                
-                # Trigger download
-                if self.trigger_download(template_info):
-                    # Wait for completion
-                    if self.wait_for_download_completion(template_info):
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(self._process_one, template_info, i, len(pending))
+                           for i, template_info in enumerate(pending, 1)]
+                for future in as_completed(futures):
+                    try:
+                        success = future.result()
+                    except Exception as e:
+                        logger.error(f"Error during template downloads: {e}")
+                        success = False
+                    
+                    if success:
                         stats["completed"] += 1
                     else:
                         stats["failed"] += 1
-                else:
-                    stats["failed"] += 1
-                
-                # Add delay between downloads
-                time.sleep(2)
             
-        except Exception as e:
-            logger.error(f"Error during template downloads: {e}")
         finally:
             self.cleanup()
         
         return stats
     
+    def _process_one(self, template_info: TemplateDownloadInfo, position: int, total: int) -> bool:
+        """Download a single template with the current thread's WebDriver"""
+        logger.info(f"Processing template {position}/{total}: {template_info.template_title}")
+        
+        # Setup web driver for this worker on first use
+        if not self.driver and not self.setup_driver():
+            logger.error("Failed to setup web driver")
+            template_info.download_status = "failed"
+            return False
+        
+        # Fetch the file directly when the page exposes its URL
+        download_url = self.get_download_url(template_info.template_id)
+        if download_url:
+            template_info.download_url = download_url
+            if self.download_file(download_url, template_info):
+                return True
+        
+        # Otherwise trigger the download in the browser, then wait for completion
+        return self.trigger_download(template_info) and self.wait_for_download_completion(template_info)
+    
+    def download_file(self, download_url: str, template_info: TemplateDownloadInfo) -> bool:
+        """
+        Stream a template file over the shared HTTP session
+        
+        Args:
+            download_url: Direct URL of the .pptx file
+            template_info: Template information
+            
+        Returns:
+            True if the file was downloaded
+        """
+        target_path = self.downloads_dir / template_info.local_filename
+        temp_path = target_path.with_suffix('.part')
+        
+        try:
+            with self.session.get(download_url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                with open(temp_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+            
+            os.replace(temp_path, target_path)
+            template_info.download_status = "completed"
+            logger.info(f"Download completed: {target_path}")
+            return True
+            
+        except Exception as e:
+            logger.warning(f"Direct download failed for {template_info.template_id}: {e}")
+            if temp_path.exists():
+                temp_path.unlink()
+            return False
+    
+    async def download_all(self, templates: List[TemplateDownloadInfo]) -> Dict[str, int]:
+        """
+        Download all selected templates over plain HTTP, concurrently
+        
+        Each template page is fetched directly and scanned for a .pptx link, so no
+        browser is needed. Templates without a discoverable link fall back to the
+        Selenium downloader.
+        
+        Args:
+            templates: List of template information objects
+            
+        Returns:
+            Dictionary with download statistics
+        """
+        if not AIOHTTP_AVAILABLE:
+            logger.warning("aiohttp not available, using Selenium downloader")
+            return self.download_templates(templates)
+        
+        if not templates:
+            logger.warning("No templates to download")
+            return {"total": 0, "completed": 0, "failed": 0}
+        
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+        connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_DOWNLOADS, keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+            results = await asyncio.gather(*(
+                self._fetch_one(session, template_info, semaphore) for template_info in templates
+            ))
+        
+        # Pages that need JavaScript to expose the download link go through the browser
+        remaining = [template_info for template_info, success in zip(templates, results) if not success]
+        if remaining and SELENIUM_AVAILABLE:
+            logger.info(f"Falling back to Selenium for {len(remaining)} templates")
+            await asyncio.get_event_loop().run_in_executor(None, self.download_templates, remaining)
+        
+        completed = sum(1 for template_info in templates if template_info.download_status == "completed")
+        for template_info in templates:
+            if template_info.download_status != "completed":
+                template_info.download_status = "failed"
+        
+        return {"total": len(templates), "completed": completed, "failed": len(templates) - completed}
+    
+    async def _fetch_one(self, session: "aiohttp.ClientSession", template_info: TemplateDownloadInfo,
+                         semaphore: asyncio.Semaphore) -> bool:
+        """Resolve and download one template over HTTP"""
+        # Check if file already exists
+        target_file = self.downloads_dir / template_info.local_filename
+        if target_file.exists():
+            logger.info(f"Template already exists, skipping: {target_file}")
+            template_info.download_status = "completed"
+            return True
+        
+        template_url = f"{self.base_url}{template_info.template_id}"
+        temp_file = target_file.with_suffix('.part')
+        
+        async with semaphore:
+            try:
+                async with session.get(template_url) as response:
+                    if response.status != 200:
+                        return False
+                    body = await response.read()
+                
+                download_url = self._extract_pptx_url(body, template_url)
+                if not download_url:
+                    return False
+                
+                logger.info(f"Found download URL: {download_url}")
+                template_info.download_url = download_url
+                template_info.download_status = "downloading"
+                
+                async with session.get(download_url) as response:
+                    if response.status != 200:
+                        return False
+                    with open(temp_file, 'wb') as f:
+                        async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                
+                os.replace(temp_file, target_file)
+                template_info.download_status = "completed"
+                logger.info(f"Download completed: {target_file}")
+                return True
+                
+            except Exception as e:
+                logger.warning(f"Direct download failed for {template_info.template_id}: {e}")
+                if temp_file.exists():
+                    temp_file.unlink()
+                return False
+    
+    def _extract_pptx_url(self, body: bytes, page_url: str) -> Optional[str]:
+        """Find the first .pptx link on a template page"""
+        # A regex over the raw bytes avoids parsing the page at all in the common case
+        match = _PPTX_HREF_RE.search(body)
+        if match:
+            href = html.unescape(match.group(1).decode('utf-8', errors='replace'))
+            return urljoin(page_url, href)
+        
+        if not BS4_AVAILABLE:
+            return None
+        
+        # Only build <a> tags instead of the whole document tree
+        soup = BeautifulSoup(body, 'html.parser', parse_only=SoupStrainer('a', href=True))
+        for link in soup.find_all('a', href=True):
+            if '.pptx' in link['href'].lower():
+                return urljoin(page_url, link['href'])
+        return None
+    
     def cleanup(self):
         """Clean up resources"""
-        if self.driver:
+        with self._drivers_lock:
+            drivers, self._drivers = self._drivers, []
+        
+        for driver in drivers:
             try:
-                self.driver.quit()
+                driver.quit()
                 logger.info("Web driver closed successfully")
             except:
                 pass
-            self.driver = None
+        self.driver = None
+        
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+        
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
     
     def generate_download_report(self, templates: List[TemplateDownloadInfo], stats: Dict[str, int]) -> str:
         """Generate a download report"""
-        report_lines = [
-            "="*60,
-            "📊 TEMPLATE DOWNLOAD REPORT",
-            "="*60,
-            f"Total templates: {stats['total']}",
-            f"✅ Successfully downloaded: {stats['completed']}",
-            f"❌ Failed downloads: {stats['failed']}",
-            f"📁 Download directory: {self.downloads_dir}",
-            "",
-            "📋 DETAILED RESULTS:",
-            "-"*40
-        ]
+        return "\n".join(self._iter_report_lines(templates, stats))
+    
+    def _iter_report_lines(self, templates: List[TemplateDownloadInfo], stats: Dict[str, int]):
+        """Yield the lines of the download report"""
+        yield "="*60
+        yield "📊 TEMPLATE DOWNLOAD REPORT"
+        yield "="*60
+        yield f"Total templates: {stats['total']}"
+        yield f"✅ Successfully downloaded: {stats['completed']}"
+        yield f"❌ Failed downloads: {stats['failed']}"
+        yield f"📁 Download directory: {self.downloads_dir}"
+        yield ""
+        yield "📋 DETAILED RESULTS:"
+        yield "-"*40
         
         for template_info in templates:
             status_emoji = "✅" if template_info.download_status == "completed" else "❌"
-            report_lines.append(f"{status_emoji} {template_info.template_title}")
-            report_lines.append(f"   ID: {template_info.template_id}")
-            report_lines.append(f"   Status: {template_info.download_status}")
+            yield f"{status_emoji} {template_info.template_title}"
+            yield f"   ID: {template_info.template_id}"
+            yield f"   Status: {template_info.download_status}"
             if template_info.download_status == "completed":
-                report_lines.append(f"   File: {template_info.local_filename}")
-            report_lines.append("")
-        
-        report_lines.extend([
-            "="*60,
-            "🎯 Download process completed!",
-            "="*60
-        ])
+                yield f"   File: {template_info.local_filename}"
+            yield ""
         
-        return "\n".join(report_lines)
+        yield "="*60
+        yield "🎯 Download process completed!"
+        yield "="*60
 
 def main():
     """Main function with command line argument support"""
@@ -492,9 +889,9 @@ def main():
     print("=" * 50)
     
     # Check dependencies
-    if not SELENIUM_AVAILABLE:
-        print("❌ Selenium not available. Install with:")
-        print("   pip install selenium webdriver-manager")
+    if not AIOHTTP_AVAILABLE and not SELENIUM_AVAILABLE:
+        print("❌ No download backend available. Install with:")
+        print("   pip install aiohttp beautifulsoup4  (or: pip install selenium webdriver-manager)")
         return
     
     # Initialize downloader
@@ -519,7 +916,7 @@ def main():
         
         # Download templates
         print("\n🔄 Starting download process...")
-        stats = downloader.download_templates(templates)
+        stats = asyncio.run(downloader.download_all(templates))
         
         # Generate and display report
         report = downloader.generate_download_report(templates, stats)
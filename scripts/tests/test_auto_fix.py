@@ -14,12 +14,24 @@ Usage:
 
 import sys
 import os
+from collections import Counter
 from pathlib import Path
 
 # Add scripts directory to path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from pptx import Presentation
 from content_verification import ContentVerifier, verify_presentation_content
+from template_management.file_utils import load_json_file, stat_or_none
+
+def _has_content_shapes(intended_content) -> bool:
+    """Check whether any intended shape would be verified (and could therefore be a critical issue)"""
+    verifier = ContentVerifier()
+    return any(
+        verifier._is_content_shape(shape)
+        for slide in intended_content
+        for shape in slide.get("shapes", [])
+    )
 
 def test_auto_fix(presentation_path: str, json_path: str):
     """Test the auto-fix functionality"""
@@ -28,44 +40,66 @@ def test_auto_fix(presentation_path: str, json_path: str):
     print("=" * 60)
     
     # Validate input files
-    if not os.path.exists(presentation_path):
+    presentation_stat = stat_or_none(presentation_path)
+    if presentation_stat is None:
         print(f"❌ Presentation file not found: {presentation_path}")
         return False
         
-    if not os.path.exists(json_path):
+    json_stat = stat_or_none(json_path)
+    if json_stat is None:
         print(f"❌ JSON file not found: {json_path}")
         return False
     
-    print(f"📄 Presentation: {os.path.basename(presentation_path)}")
-    print(f"📋 JSON Source: {os.path.basename(json_path)}")
+    print(f"📄 Presentation: {os.path.basename(presentation_path)} ({presentation_stat.st_size / 1024:.1f} KB)")
+    print(f"📋 JSON Source: {os.path.basename(json_path)} ({json_stat.st_size / 1024:.1f} KB)")
     print("=" * 60)
     
+    # Load the JSON and presentation once and share them between both verification passes
+    try:
+        intended_content = load_json_file(json_path)
+    except (OSError, ValueError) as e:  # JSON decode errors are ValueErrors
+        print(f"❌ Could not load JSON file {json_path}: {e}")
+        return False
+    
+    # Without content shapes verification cannot report critical issues, so skip opening the presentation
+    if not _has_content_shapes(intended_content):
+        print("\n✅ No content shapes in the JSON - verification and auto-fix not needed!")
+        return True
+    
+    try:
+        prs = Presentation(presentation_path)
+    except Exception as e:
+        print(f"❌ Could not open presentation {presentation_path}: {e}")
+        return False
+    
     # Step 1: Initial verification without auto-fix
     print("\n🔍 STEP 1: INITIAL VERIFICATION (no auto-fix)")
     print("-" * 50)
     
     initial_result = verify_presentation_content(
         presentation_path, json_path, 
-        debug=True, auto_fix_critical=False
+        debug=True, auto_fix_critical=False,
+        presentation=prs, intended_content=intended_content
     )
     
-    critical_issues = [m for m in initial_result.mismatches if m.severity == "critical"]
-    warning_issues = [m for m in initial_result.mismatches if m.severity == "warning"]
+    severity_counts = Counter(m.severity for m in initial_result.mismatches)
+    critical_count = severity_counts["critical"]
     
     print(f"\n📊 Initial Status: {initial_result.overall_status.upper()}")
     print(f"   Success rate: {initial_result.success_rate:.1f}%")
-    print(f"   Critical issues: {len(critical_issues)}")
-    print(f"   Warning issues: {len(warning_issues)}")
+    print(f"   Critical issues: {critical_count}")
+    print(f"   Warning issues: {severity_counts['warning']}")
     
     # Step 2: Auto-fix verification
-    if critical_issues:
+    if critical_count:
         print("\n🔧 STEP 2: AUTO-FIX VERIFICATION")
         print("-" * 50)
-        print(f"Found {len(critical_issues)} critical issues - attempting auto-fix...")
+        print(f"Found {critical_count} critical issues - attempting auto-fix...")
         
         auto_fix_result = verify_presentation_content(
             presentation_path, json_path,
-            debug=True, auto_fix_critical=True
+            debug=True, auto_fix_critical=True,
+            presentation=prs, intended_content=intended_content
         )
         
         print(f"\n📊 Post Auto-Fix Status: {auto_fix_result.overall_status.upper()}")
@@ -83,11 +117,10 @@ def test_auto_fix(presentation_path: str, json_path: str):
                 print(f"   Post-repair success rate: {auto_fix_result.post_repair_success_rate:.1f}%")
                 print(f"   Improvement: {improvement:+.1f}%")
                 
-                remaining_critical = sum(1 for m in (auto_fix_result.post_repair_mismatches or []) if m.severity == "critical")
-                remaining_warnings = sum(1 for m in (auto_fix_result.post_repair_mismatches or []) if m.severity == "warning")
+                remaining_counts = Counter(m.severity for m in (auto_fix_result.post_repair_mismatches or []))
                 
-                print(f"   Remaining critical issues: {remaining_critical}")
-                print(f"   Remaining warning issues: {remaining_warnings}")
+                print(f"   Remaining critical issues: {remaining_counts['critical']}")
+                print(f"   Remaining warning issues: {remaining_counts['warning']}")
         
         # Step 3: Summary and recommendations
         print("\n📈 STEP 3: SUMMARY & RECOMMENDATIONS")
@@ -10,6 +10,31 @@ import json
 import tempfile
 from pathlib import Path
 
+# Sample fixture contents, built once and shared by every file of the same type
+_SAMPLE_JSON_BYTES = json.dumps([
+    {
+        "slide_index": 0,
+        "slide_layout_name": "Title Slide",
+        "shapes": [
+            {
+                "name": "Title 1",
+                "text": "Sample Presentation Title",
+                "placeholder_type": "TITLE"
+            }
+        ]
+    }
+], indent=2).encode('utf-8')
+# Some dummy data to simulate a PPTX file (just a placeholder)
+_SAMPLE_PPTX_BYTES = b"PK\x03\x04" + b"DUMMY_PPTX_CONTENT_FOR_TESTING" * 1000
+
+def _write_bytes(file_path: Path, data: bytes):
+    """Write data to file_path with a single unbuffered write"""
+    fd = os.open(str(file_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
 def create_sample_files():
     """Create sample files in content, output, and downloaded_templates directories"""
     print("🎭 CREATING SAMPLE FILES FOR CLEANUP TESTING")
@@ -51,30 +76,13 @@ def create_sample_files():
                 # Create sample content based on file type
                 if filename.endswith('.json'):
                     # Create sample JSON content
-                    sample_data = [
-                        {
-                            "slide_index": 0,
-                            "slide_layout_name": "Title Slide",
-                            "shapes": [
-                                {
-                                    "name": "Title 1",
-                                    "text": "Sample Presentation Title",
-                                    "placeholder_type": "TITLE"
-                                }
-                            ]
-                        }
-                    ]
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump(sample_data, f, indent=2)
+                    _write_bytes(file_path, _SAMPLE_JSON_BYTES)
                     file_size = 0.5  # Estimated KB
                 
                 elif filename.endswith('.pptx'):
                     # Create dummy PPTX file (just a placeholder)
-                    with open(file_path, 'wb') as f:
-                        # Write some dummy data to simulate a PPTX file
-                        dummy_data = b"PK\x03\x04" + b"DUMMY_PPTX_CONTENT_FOR_TESTING" * 1000
-                        f.write(dummy_data)
-                    file_size = len(dummy_data) / 1024  # Size in KB
+                    _write_bytes(file_path, _SAMPLE_PPTX_BYTES)
+                    file_size = len(_SAMPLE_PPTX_BYTES) / 1024  # Size in KB
                 
                 else:
                     # Create generic text file
@@ -95,7 +103,12 @@ def create_sample_files():
     return total_files_created
 
 def count_files_in_directories():
-    """Count files in the cleanup target directories"""
+    """
+    Count files in the cleanup target directories
+    
+    Returns (total_files, file_details, file_names) where file_names maps each
+    existing directory to the names of its files, so callers don't re-scan it
+    """
     directories = [
         "./content",
         "./output", 
@@ -104,17 +117,22 @@ def count_files_in_directories():
     
     total_files = 0
     file_details = {}
+    file_names = {}
     
     for directory in directories:
-        dir_path = Path(directory)
-        if dir_path.exists():
-            files = [f for f in dir_path.iterdir() if f.is_file()]
-            file_details[directory] = len(files)
-            total_files += len(files)
-        else:
+        try:
+            # DirEntry.is_file() uses the type from the directory listing, no extra stat
+            with os.scandir(directory) as entries:
+                names = [entry.name for entry in entries if entry.is_file()]
+        except FileNotFoundError:
             file_details[directory] = 0
+            continue
+        
+        file_names[directory] = names
+        file_details[directory] = len(names)
+        total_files += len(names)
     
-    return total_files, file_details
+    return total_files, file_details, file_names
 
 def test_template_clean_flag():
     """Test the --template_clean flag functionality"""
@@ -122,7 +140,7 @@ def test_template_clean_flag():
     print("-" * 40)
     
     # Count files before
-    before_count, before_details = count_files_in_directories()
+    before_count, before_details, before_names = count_files_in_directories()
     
     print(f"📊 Files before cleanup:")
     for directory, count in before_details.items():
@@ -133,13 +151,12 @@ def test_template_clean_flag():
     print(f"💡 In real usage: python3 main.py --template_clean")
     print(f"   This would delete only files in ./template/downloaded_templates/")
     
-    # Count what would be deleted
-    template_dir = Path("./template/downloaded_templates")
-    if template_dir.exists():
-        template_files = [f for f in template_dir.iterdir() if f.is_file()]
+    # Count what would be deleted, reusing the listing from above
+    template_files = before_names.get("./template/downloaded_templates")
+    if template_files is not None:
         print(f"   Would delete {len(template_files)} template files")
-        for file_path in template_files:
-            print(f"     - {file_path.name}")
+        for file_name in template_files:
+            print(f"     - {file_name}")
     else:
         print(f"   No template directory found")
 
@@ -149,7 +166,7 @@ def test_cleanall_flag():
     print("-" * 50)
     
     # Count files before
-    before_count, before_details = count_files_in_directories()
+    before_count, before_details, _ = count_files_in_directories()
     
     print(f"📊 Files before cleanup:")
     total_files = 0
@@ -210,7 +227,7 @@ def main():
     print("=" * 60)
     
     # Check if sample files exist, create if needed
-    total_files, _ = count_files_in_directories()
+    total_files, _, _ = count_files_in_directories()
     
     if total_files == 0:
         print("📁 No sample files found. Creating sample files for testing...")
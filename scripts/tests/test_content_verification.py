@@ -8,21 +8,27 @@ has been properly applied to the generated PowerPoint presentation.
 Usage: python3 test_content_verification.py
 """
 
-import json
+import re
 import sys
 import os
 from pptx import Presentation
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, FrozenSet
+
+# Add scripts directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from template_management.file_utils import load_json_file, stat_or_none
 
 # Configuration
 UPDATED_JSON_PATH = "./content/slide_details_updated.json"
 OUTPUT_PPTX_PATH = "./output/template_updated.pptx"
 
+_WS_RE = re.compile(r'\s+')
+
 def load_expected_content(json_path: str) -> List[Dict]:
     """Load the expected content from the JSON file."""
     try:
-        with open(json_path, 'r') as f:
-            return json.load(f)
+        return load_json_file(json_path)
     except Exception as e:
         print(f"Error loading JSON file '{json_path}': {e}")
         return []
@@ -30,43 +36,80 @@ def load_expected_content(json_path: str) -> List[Dict]:
 def extract_text_from_slide(slide) -> List[str]:
     """Extract all text content from a slide."""
     texts = []
-    for shape in slide.shapes:
-        if shape.has_text_frame and shape.text.strip():
-            # Clean and normalize the text
-            text = shape.text.strip()
-            if text:
-                texts.append(text)
+    # Read text straight from the slide XML instead of building python-pptx shape/run wrappers.
+    # Mirrors shape.text: runs joined per paragraph, paragraphs joined by newlines, <a:br/> as vertical tab
+    for sp in slide.element.xpath('./p:cSld/p:spTree/p:sp[p:txBody]'):
+        paragraphs = [
+            "".join(node if isinstance(node, str) else "\v"
+                    for node in p.xpath('./a:r/a:t/text() | ./a:fld/a:t/text() | ./a:br'))
+            for p in sp.xpath('./p:txBody/a:p')
+        ]
+        # Clean and normalize the text
+        text = "\n".join(paragraphs).strip()
+        if text:
+            texts.append(text)
     return texts
 
 def normalize_text(text: str) -> str:
     """Normalize text for comparison by removing extra whitespace and converting to lowercase."""
     if not text:
         return ""
+    stripped = text.strip()
+    # Already normalized: lowercase, and isprintable() rules out every whitespace except
+    # the plain space, so only doubled spaces would still need collapsing
+    if stripped.islower() and stripped.isprintable() and '  ' not in stripped:
+        return stripped
     # Replace multiple whitespaces/newlines with single spaces
-    import re
-    normalized = re.sub(r'\s+', ' ', text.strip().lower())
+    normalized = _WS_RE.sub(' ', stripped.lower())
     return normalized
 
-def text_similarity_check(expected: str, actual_texts: List[str], threshold: float = 0.8) -> Tuple[bool, str]:
+def normalize_actual_texts(actual_texts: List[str]) -> List[Tuple[str, str, FrozenSet[str]]]:
+    """Normalize a slide's texts once as (original, normalized, word set) tuples for text_similarity_check."""
+    normalized_actuals = []
+    for actual in actual_texts:
+        actual_norm = normalize_text(actual)
+        normalized_actuals.append((actual, actual_norm, frozenset(actual_norm.split())))
+    return normalized_actuals
+
+def build_actual_text_index(actual_texts: List[str]) -> Dict:
+    """
+    Index a slide's texts once for text_similarity_check.
+    Returns the normalized entries, a normalized-text -> original map for exact matches
+    and a word -> entry positions inverted index for word similarity.
+    """
+    entries = normalize_actual_texts(actual_texts)
+    exact = {}
+    words = {}
+    for position, (actual, actual_norm, actual_words) in enumerate(entries):
+        exact.setdefault(actual_norm, actual)  # First occurrence wins, as in a linear scan
+        for word in actual_words:
+            words.setdefault(word, []).append(position)
+    return {"entries": entries, "exact": exact, "words": words}
+
+def text_similarity_check(expected: str, actual_index: Dict, threshold: float = 0.8) -> Tuple[bool, str]:
     """
     Check if expected text is found in actual texts with similarity matching.
+    actual_index comes from build_actual_text_index so each slide is normalized and indexed only once.
     Returns (found, best_match)
     """
-    if not expected or not actual_texts:
+    normalized_actuals = actual_index["entries"]
+    if not expected or not normalized_actuals:
         return False, ""
     
     expected_norm = normalize_text(expected)
     
     # First try exact match
-    for actual in actual_texts:
-        actual_norm = normalize_text(actual)
-        if expected_norm == actual_norm:
-            return True, actual
+    if expected_norm in actual_index["exact"]:
+        return True, actual_index["exact"][expected_norm]
     
-    # Then try substring match
-    for actual in actual_texts:
-        actual_norm = normalize_text(actual)
-        if expected_norm in actual_norm or actual_norm in expected_norm:
+    # Then try substring match (character-level, so this still needs a scan);
+    # only the shorter string can be contained in the longer one
+    expected_len = len(expected_norm)
+    for actual, actual_norm, _ in normalized_actuals:
+        if len(actual_norm) >= expected_len:
+            if expected_norm in actual_norm:
+                return True, actual
+        elif actual_norm in expected_norm:
             return True, actual
     
     # Finally try word-based similarity
@@ -74,12 +117,21 @@ def text_similarity_check(expected: str, actual_texts: List[str], threshold: flo
     best_match = ""
     best_score = 0
     
-    for actual in actual_texts:
-        actual_norm = normalize_text(actual)
-        actual_words = set(actual_norm.split())
-        
+    # Only texts sharing at least one word can score above zero; keep slide order for ties
+    candidate_positions = set()
+    for word in expected_words:
+        candidate_positions.update(actual_index["words"].get(word, ()))
+    
+    for position in sorted(candidate_positions):
+        actual, _, actual_words = normalized_actuals[position]
         if not expected_words or not actual_words:
             continue
+        
+        # Jaccard similarity can never exceed the ratio of the two set sizes,
+        # so skip candidates that cannot beat the current best
+        smaller, larger = sorted((len(expected_words), len(actual_words)))
+        if smaller / larger <= best_score:
+            continue
             
         # Calculate Jaccard similarity
         intersection = len(expected_words.intersection(actual_words))
@@ -92,6 +144,65 @@ def text_similarity_check(expected: str, actual_texts: List[str], threshold: flo
     
     return best_score >= threshold, best_match
 
+def _has_text_to_verify(slide_data: Dict) -> bool:
+    """Check whether a slide has any expected text that verification would look for."""
+    return any(
+        shape_data.get("text") and shape_data.get("text").strip()
+        and shape_data.get("placeholder_type", "Unknown") != "SLIDE_NUMBER"
+        for shape_data in slide_data.get("shapes", [])
+    )
+
+def _verify_slide(slide, slide_data: Dict) -> Tuple[List[Dict], int, int]:
+    """
+    Check one slide's expected shapes against the text on the slide.
+    Returns (missing_content, applied_count, text_shape_count)
+    """
+    slide_index = slide_data.get("slide_index", 0)
+    slide_layout = slide_data.get("slide_layout_name", "Unknown")
+    
+    actual_texts = extract_text_from_slide(slide)
+    actual_index = build_actual_text_index(actual_texts)
+    
+    slide_missing_content = []
+    slide_text_shapes = 0
+    slide_applied_content = 0
+    
+    # Check each shape with text content
+    for shape_data in slide_data.get("shapes", []):
+        get = shape_data.get
+        expected_text = get("text")
+        if not expected_text or not expected_text.strip():
+            continue
+        
+        placeholder_type = get("placeholder_type", "Unknown")
+        
+        # Skip slide number placeholders - they are not applied by design
+        if placeholder_type == "SLIDE_NUMBER":
+            continue
+            
+        slide_text_shapes += 1
+        
+        shape_name = get("name", "Unknown")
+        
+        # Check if this content was applied
+        found, best_match = text_similarity_check(expected_text, actual_index)
+        
+        if found:
+            slide_applied_content += 1
+        else:
+            missing_info = {
+                "slide_number": slide_index + 1,
+                "slide_layout": slide_layout,
+                "placeholder_type": placeholder_type,
+                "shape_name": shape_name,
+                # Full texts are kept (the slide's text list is shared, not copied); previews are cut when printed
+                "expected_text": expected_text,
+                "available_texts": actual_texts
+            }
+            slide_missing_content.append(missing_info)
+    
+    return slide_missing_content, slide_applied_content, slide_text_shapes
+
 def verify_content_application(json_path: str, pptx_path: str) -> Dict:
     """
     Verify that all content from JSON has been applied to the PowerPoint file.
@@ -102,7 +213,7 @@ def verify_content_application(json_path: str, pptx_path: str) -> Dict:
         "total_text_shapes": 0,
         "successfully_applied": 0,
         "missing_content": [],
-        "slides_with_issues": [],
+        "slides_with_issues": set(),
         "success_rate": 0.0
     }
     
@@ -126,69 +237,51 @@ def verify_content_application(json_path: str, pptx_path: str) -> Dict:
     print(f"📊 Actual slides: {len(prs.slides)}")
     print()
     
-    # Verify each slide
+    # Pair each expected slide with its actual slide (None when missing from the deck)
+    slide_pairs = []
     for slide_data in expected_slides:
+        slide_index = slide_data.get("slide_index", 0)
+        actual_slide = prs.slides[slide_index] if slide_index < len(prs.slides) else None
+        slide_pairs.append((slide_data, actual_slide))
+    # Slides without expected text need no text extraction at all
+    present_slides = [(slide_data, actual_slide) for slide_data, actual_slide in slide_pairs
+                      if actual_slide is not None and _has_text_to_verify(slide_data)]
+    
+    slide_results = iter([_verify_slide(actual_slide, slide_data) for slide_data, actual_slide in present_slides])
+    
+    # Collect and report results in slide order, writing the report in one go
+    report_lines = []
+    w = report_lines.append
+    for slide_data, actual_slide in slide_pairs:
         slide_index = slide_data.get("slide_index", 0)
         slide_layout = slide_data.get("slide_layout_name", "Unknown")
         
-        if slide_index >= len(prs.slides):
-            print(f"❌ Slide {slide_index + 1} ({slide_layout}): Slide not found in presentation")
-            results["slides_with_issues"].append(slide_index + 1)
+        if actual_slide is None:
+            w(f"❌ Slide {slide_index + 1} ({slide_layout}): Slide not found in presentation")
+            results["slides_with_issues"].add(slide_index + 1)
             continue
         
-        actual_slide = prs.slides[slide_index]
-        actual_texts = extract_text_from_slide(actual_slide)
-        
-        slide_missing_content = []
-        slide_text_shapes = 0
-        slide_applied_content = 0
-        
-        # Check each shape with text content
-        for shape_data in slide_data.get("shapes", []):
-            expected_text = shape_data.get("text")
-            if not expected_text or not expected_text.strip():
-                continue
-            
-            placeholder_type = shape_data.get("placeholder_type", "Unknown")
-            
-            # Skip slide number placeholders - they are not applied by design
-            if placeholder_type == "SLIDE_NUMBER":
-                continue
-                
-            slide_text_shapes += 1
-            results["total_text_shapes"] += 1
-            
-            shape_name = shape_data.get("name", "Unknown")
-            
-            # Check if this content was applied
-            found, best_match = text_similarity_check(expected_text, actual_texts)
-            
-            if found:
-                slide_applied_content += 1
-                results["successfully_applied"] += 1
-            else:
-                missing_info = {
-                    "slide_number": slide_index + 1,
-                    "slide_layout": slide_layout,
-                    "placeholder_type": placeholder_type,
-                    "shape_name": shape_name,
-                    "expected_text": expected_text[:100] + "..." if len(expected_text) > 100 else expected_text,
-                    "available_texts": [text[:50] + "..." if len(text) > 50 else text for text in actual_texts]
-                }
-                slide_missing_content.append(missing_info)
-                results["missing_content"].append(missing_info)
+        if _has_text_to_verify(slide_data):
+            slide_missing_content, slide_applied_content, slide_text_shapes = next(slide_results)
+        else:
+            slide_missing_content, slide_applied_content, slide_text_shapes = [], 0, 0
+        results["total_text_shapes"] += slide_text_shapes
+        results["successfully_applied"] += slide_applied_content
+        results["missing_content"].extend(slide_missing_content)
         
         # Report slide status
         if slide_missing_content:
-            results["slides_with_issues"].append(slide_index + 1)
-            print(f"⚠️  Slide {slide_index + 1} ({slide_layout}): {slide_applied_content}/{slide_text_shapes} content applied")
+            results["slides_with_issues"].add(slide_index + 1)
+            w(f"⚠️  Slide {slide_index + 1} ({slide_layout}): {slide_applied_content}/{slide_text_shapes} content applied")
             for missing in slide_missing_content:
-                print(f"   ❌ Missing {missing['placeholder_type']}: {missing['expected_text']}")
+                w(f"   ❌ Missing {missing['placeholder_type']}: {_preview(missing['expected_text'], 100)}")
         else:
             if slide_text_shapes > 0:
-                print(f"✅ Slide {slide_index + 1} ({slide_layout}): All {slide_text_shapes} content applied")
+                w(f"✅ Slide {slide_index + 1} ({slide_layout}): All {slide_text_shapes} content applied")
             else:
-                print(f"ℹ️  Slide {slide_index + 1} ({slide_layout}): No text content to verify")
+                w(f"ℹ️  Slide {slide_index + 1} ({slide_layout}): No text content to verify")
+    if report_lines:
+        sys.stdout.write("\n".join(report_lines) + "\n")
     
     # Calculate success rate
     if results["total_text_shapes"] > 0:
@@ -196,44 +289,53 @@ def verify_content_application(json_path: str, pptx_path: str) -> Dict:
     
     return results
 
+def _preview(text: str, limit: int = 50) -> str:
+    """Shorten text for display, marking the cut with '...'."""
+    return text[:limit] + "..." if len(text) > limit else text
+
 def print_summary_report(results: Dict):
     """Print a comprehensive summary report."""
-    print("\n" + "="*60)
-    print("📋 CONTENT VERIFICATION SUMMARY REPORT")
-    print("="*60)
+    # Build the whole report and write it with a single call
+    report_lines = []
+    w = report_lines.append
+    w("\n" + "="*60)
+    w("📋 CONTENT VERIFICATION SUMMARY REPORT")
+    w("="*60)
     
-    print(f"📊 Total slides verified: {results['total_slides']}")
-    print(f"📊 Total text shapes: {results['total_text_shapes']}")
-    print(f"✅ Successfully applied: {results['successfully_applied']}")
-    print(f"❌ Missing content: {len(results['missing_content'])}")
-    print(f"📈 Success rate: {results['success_rate']:.1f}%")
+    w(f"📊 Total slides verified: {results['total_slides']}")
+    w(f"📊 Total text shapes: {results['total_text_shapes']}")
+    w(f"✅ Successfully applied: {results['successfully_applied']}")
+    w(f"❌ Missing content: {len(results['missing_content'])}")
+    w(f"📈 Success rate: {results['success_rate']:.1f}%")
     
     if results["slides_with_issues"]:
-        print(f"\n⚠️  Slides with issues: {', '.join(map(str, results['slides_with_issues']))}")
+        w(f"\n⚠️  Slides with issues: {', '.join(map(str, sorted(results['slides_with_issues'])))}")
     
     if results["missing_content"]:
-        print(f"\n❌ DETAILED MISSING CONTENT:")
-        print("-" * 40)
+        w(f"\n❌ DETAILED MISSING CONTENT:")
+        w("-" * 40)
         for i, missing in enumerate(results["missing_content"], 1):
-            print(f"{i}. Slide {missing['slide_number']} ({missing['slide_layout']})")
-            print(f"   Type: {missing['placeholder_type']}")
-            print(f"   Shape: {missing['shape_name']}")
-            print(f"   Expected: {missing['expected_text']}")
+            w(f"{i}. Slide {missing['slide_number']} ({missing['slide_layout']})")
+            w(f"   Type: {missing['placeholder_type']}")
+            w(f"   Shape: {missing['shape_name']}")
+            w(f"   Expected: {_preview(missing['expected_text'], 100)}")
             if missing['available_texts']:
-                print(f"   Available: {missing['available_texts']}")
+                w(f"   Available: {[_preview(text) for text in missing['available_texts']]}")
             else:
-                print(f"   Available: [No text found on slide]")
-            print()
+                w(f"   Available: [No text found on slide]")
+            w("")
     
     # Overall status
     if results["success_rate"] == 100:
-        print("🎉 RESULT: ALL CONTENT SUCCESSFULLY APPLIED!")
+        w("🎉 RESULT: ALL CONTENT SUCCESSFULLY APPLIED!")
     elif results["success_rate"] >= 90:
-        print("✅ RESULT: MOSTLY SUCCESSFUL (Minor issues)")
+        w("✅ RESULT: MOSTLY SUCCESSFUL (Minor issues)")
     elif results["success_rate"] >= 70:
-        print("⚠️  RESULT: PARTIALLY SUCCESSFUL (Some issues)")
+        w("⚠️  RESULT: PARTIALLY SUCCESSFUL (Some issues)")
     else:
-        print("❌ RESULT: SIGNIFICANT ISSUES DETECTED")
+        w("❌ RESULT: SIGNIFICANT ISSUES DETECTED")
+    
+    sys.stdout.write("\n".join(report_lines) + "\n")
 
 def main():
     """Main function to run the content verification test."""
@@ -241,18 +343,20 @@ def main():
     print("=" * 50)
     
     # Check if files exist
-    if not os.path.exists(UPDATED_JSON_PATH):
+    json_stat = stat_or_none(UPDATED_JSON_PATH)
+    if json_stat is None:
         print(f"❌ JSON file not found: {UPDATED_JSON_PATH}")
         print("Please run main.py first to generate the content.")
         sys.exit(1)
     
-    if not os.path.exists(OUTPUT_PPTX_PATH):
+    pptx_stat = stat_or_none(OUTPUT_PPTX_PATH)
+    if pptx_stat is None:
         print(f"❌ PowerPoint file not found: {OUTPUT_PPTX_PATH}")
         print("Please run main.py first to generate the presentation.")
         sys.exit(1)
     
-    print(f"📁 JSON file: {UPDATED_JSON_PATH}")
-    print(f"📁 PPTX file: {OUTPUT_PPTX_PATH}")
+    print(f"📁 JSON file: {UPDATED_JSON_PATH} ({json_stat.st_size / 1024:.1f} KB)")
+    print(f"📁 PPTX file: {OUTPUT_PPTX_PATH} ({pptx_stat.st_size / 1024:.1f} KB)")
     print()
     
     # Run verification
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for re-applying the same JSON with update_presentation_from_json.
+
+Builds a small presentation, applies a JSON update to it, then applies the same
+JSON again. The second run must find every shape already up to date and leave
+the file on disk untouched.
+
+Usage:
+    python3 test_update_presentation_rerun.py
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+# Add scripts directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pptx import Presentation
+from update_presentation_from_json import update_presentation_from_json
+
+def create_sample_presentation(pptx_path: str):
+    """Create a 3-slide presentation and return JSON updates for its text shapes"""
+    prs = Presentation()
+    slides_data = []
+
+    for slide_idx, name in enumerate(["Intro", "Details", "Summary"]):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"{name} title"
+        slide.placeholders[1].text = f"{name} body"
+        slides_data.append({
+            "slide_index": slide_idx,
+            "shapes": [
+                {"shape_id": slide.shapes.title.shape_id, "text": f"Updated {name} title"},
+                {"shape_id": slide.placeholders[1].shape_id, "text": f"First {name} point\nSecond {name} point"}
+            ]
+        })
+
+    prs.save(pptx_path)
+    return slides_data
+
+def read_slide_texts(pptx_path: str):
+    """Return the text of every text frame, slide by slide"""
+    prs = Presentation(pptx_path)
+    return [[shape.text_frame.text for shape in slide.shapes if shape.has_text_frame] for slide in prs.slides]
+
+def test_reapply_same_json():
+    """Re-applying the same JSON should skip every shape and not rewrite the file"""
+    print("🔁 RE-APPLY SAME JSON TEST")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pptx_path = os.path.join(temp_dir, "presentation.pptx")
+        json_path = os.path.join(temp_dir, "slide_details_updated.json")
+
+        slides_data = create_sample_presentation(pptx_path)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(slides_data, f, indent=2)
+
+        print("\n📝 First run (applies the updates):")
+        if not update_presentation_from_json(json_path, pptx_path):
+            print("❌ First update failed")
+            return False
+        texts_after_first = read_slide_texts(pptx_path)
+        stat_after_first = os.stat(pptx_path)
+        with open(pptx_path, 'rb') as f:
+            bytes_after_first = f.read()
+
+        print("\n📝 Second run (same JSON, nothing to change):")
+        if not update_presentation_from_json(json_path, pptx_path):
+            print("❌ Second update failed")
+            return False
+        texts_after_second = read_slide_texts(pptx_path)
+        with open(pptx_path, 'rb') as f:
+            bytes_after_second = f.read()
+
+        expected_texts = [["\n" + shape["text"] for shape in slide["shapes"]] for slide in slides_data]
+
+        checks = [
+            ("Updated text was applied", texts_after_first == expected_texts),
+            ("Second run kept the same text", texts_after_second == texts_after_first),
+            ("Second run left the file untouched",
+             bytes_after_second == bytes_after_first and os.stat(pptx_path).st_mtime_ns == stat_after_first.st_mtime_ns),
+        ]
+
+        print(f"\n📊 RESULTS:")
+        for description, passed in checks:
+            print(f"   {'✅' if passed else '❌'} {description}")
+
+        return all(passed for _, passed in checks)
+
+def main():
+    """Main test function"""
+    success = test_reapply_same_json()
+
+    if success:
+        print(f"\n✅ Re-apply test completed successfully!")
+    else:
+        print(f"\n❌ Re-apply test failed!")
+
+    sys.exit(0 if success else 1)
+
+if __name__ == "__main__":
+    main()
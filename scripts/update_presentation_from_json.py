@@ -1,6 +1,165 @@
 import json
+import logging
+import os
+import stat
+import tempfile
+import zipfile
+from itertools import chain, groupby
+from lxml.etree import SubElement
 from pptx import Presentation
-from pptx.util import Inches # Though not strictly needed for text update, good to have if positions were also updated
+from pptx.oxml.ns import qn
+from template_management.file_utils import load_json_file
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+    # Raised while a streamed document is consumed, after the initial read succeeded
+    STREAMING_JSON_ERRORS = (ijson.JSONError,)
+except ImportError:
+    IJSON_AVAILABLE = False
+    STREAMING_JSON_ERRORS = ()
+
+# JSON files larger than this are streamed slide by slide (when ijson is installed)
+STREAMING_JSON_THRESHOLD = 16 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+def _stream_slides_data(json_path):
+    """Yield slide entries from a top-level JSON array one at a time"""
+    with open(json_path, 'rb') as f:
+        events = ijson.parse(f)
+        first_event = next(events, None)
+        # items() would quietly yield nothing for any other top-level value
+        if first_event is None or first_event[1] != 'start_array':
+            raise ijson.JSONError("top-level JSON value is not an array")
+        for slide_data in ijson.items(chain((first_event,), events), 'item'):
+            yield slide_data
+
+def _update_slide_shapes(slide, slide_idx, shapes_data):
+    """
+    Applies the JSON text updates for a single slide.
+
+    Args:
+        slide: The python-pptx slide to update.
+        slide_idx (int): Index of the slide, used in warnings.
+        shapes_data (list): Shape entries from the JSON targeting this slide.
+
+    Returns:
+        tuple: (updated_shapes_count, unchanged_shapes_count, missing_shape_ids)
+    """
+    updated_shapes_count = 0
+    unchanged_shapes_count = 0
+    missing_shape_ids = []
+
+    # Index shapes by ID once per slide; the first shape wins if IDs repeat, as with a linear scan.
+    # has_text_frame is read here once, alongside the shape
+    shape_map = {}
+    for s in slide.shapes:
+        if s.shape_id not in shape_map:
+            shape_map[s.shape_id] = (s, s.has_text_frame)
+
+    # Collect the text to apply per shape first: entries without text have nothing to update,
+    # and when a shape appears more than once only its last text would survive anyway
+    updates = {}
+    for shape_data in shapes_data:
+        # shape_id is required and almost always present, so index directly
+        try:
+            shape_id = shape_data["shape_id"]
+        except KeyError:
+            shape_id = None
+
+        if shape_id is None:
+            logger.warning("Warning: Shape data on slide %s missing 'shape_id'. Skipping shape.", slide_idx)
+            continue
+
+        new_text = shape_data.get("text") # Expecting new text here
+        if new_text is not None: # Only update if new_text is provided
+            updates[shape_id] = new_text
+
+    for shape_id, new_text in updates.items():
+        shape_entry = shape_map.get(shape_id)
+        
+        if shape_entry is not None:
+            found_shape, has_text_frame = shape_entry
+            if has_text_frame:
+                # Leave shapes that already hold the text this update would write untouched.
+                # clear() keeps one empty paragraph ahead of the appended lines, so a
+                # previously updated shape reads back as "\n" + new_text
+                if found_shape.text_frame.text == "\n" + new_text:
+                    unchanged_shapes_count += 1
+                    continue
+
+                # Clear existing content to ensure formatting is based on the shape's style
+                # not carried over from old paragraph runs if they had different styles.
+                found_shape.text_frame.clear() 
+                
+                # Split the input text by newline characters (most text is a single line)
+                lines = new_text.split('\n') if '\n' in new_text else (new_text,)
+                
+                # Handle case where new_text might be an empty string,
+                # which split('\n') results in [''].
+                # If new_text was truly empty, we want one empty paragraph.
+                # If new_text had content, lines will have that content.
+                if not lines and new_text == "": # Handles empty string input correctly
+                    p = found_shape.text_frame.add_paragraph()
+                    p.text = "" # Explicitly set an empty paragraph
+                else:
+                    txBody = found_shape.text_frame._txBody
+                    for line_content in lines:
+                        # Each line becomes a new paragraph.
+                        # This new paragraph will inherit the style (including bullet formatting)
+                        # from the text frame or its placeholder definition in the template.
+                        if line_content.isprintable():
+                            # Build the same <a:p><a:r><a:t> XML that add_paragraph() + p.text
+                            # would, without creating python-pptx paragraph/run objects
+                            p = SubElement(txBody, qn('a:p'))
+                            if line_content:
+                                SubElement(SubElement(p, qn('a:r')), qn('a:t')).text = line_content
+                        else:
+                            # Let python-pptx turn vertical tabs into line breaks and escape control characters
+                            p = found_shape.text_frame.add_paragraph()
+                            p.text = line_content
+                        
+                updated_shapes_count += 1
+            else:
+                logger.warning("Warning: Shape ID %s on slide %s does not have a text frame. Cannot update text: '%s...'", shape_id, slide_idx, new_text[:50])
+        else:
+            # Reported once per slide after all updates
+            missing_shape_ids.append(shape_id)
+
+    return updated_shapes_count, unchanged_shapes_count, missing_shape_ids
+
+def _save_changed_slides(pptx_path, changed_slides, original_partnames):
+    """
+    Writes changed slides back into the .pptx without re-serializing the rest of the package.
+
+    Every other part is copied from the original archive as-is, so only the XML of the
+    updated slides goes through lxml. The archive is rebuilt in a temporary file and
+    moved over the original.
+
+    Args:
+        pptx_path (str): Path of the presentation the slides were loaded from.
+        changed_slides (list): Slides whose XML was modified.
+        original_partnames (dict): Part name each slide part had in the archive, captured
+            before prs.slides renamed the slide parts into presentation order.
+    """
+    changed_parts = {original_partnames[slide.part].lstrip('/'): slide.part.blob for slide in changed_slides}
+    if not changed_parts:
+        return  # Nothing changed, the file on disk is already up to date
+
+    fd, temp_path = tempfile.mkstemp(suffix='.pptx', dir=os.path.dirname(os.path.abspath(pptx_path)))
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(pptx_path) as src, zipfile.ZipFile(temp_path, 'w') as dst:
+            for info in src.infolist():
+                data = changed_parts.get(info.filename)
+                dst.writestr(info, data if data is not None else src.read(info.filename))
+        os.chmod(temp_path, stat.S_IMODE(os.stat(pptx_path).st_mode))
+        os.replace(temp_path, pptx_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
 
 def update_presentation_from_json(json_path, pptx_path):
     """
@@ -11,13 +170,18 @@ def update_presentation_from_json(json_path, pptx_path):
         json_path (str): Path to the JSON file with slide and shape details.
         pptx_path (str): Path to the PowerPoint file to be updated.
     """
+    streaming = False
     try:
-        with open(json_path, 'r') as f:
-            all_slides_data = json.load(f)
+        if IJSON_AVAILABLE and os.path.getsize(json_path) > STREAMING_JSON_THRESHOLD:
+            # Large files: process entries as they are parsed instead of loading the whole document
+            all_slides_data = _stream_slides_data(json_path)
+            streaming = True
+        else:
+            all_slides_data = load_json_file(json_path)
     except FileNotFoundError:
         print(f"Error: JSON file not found at '{json_path}'")
         return False
-    except json.JSONDecodeError:
+    except json.JSONDecodeError:  # orjson.JSONDecodeError is a subclass
         print(f"Error: Could not decode JSON from '{json_path}'")
         return False
     except Exception as e:
@@ -30,78 +194,71 @@ def update_presentation_from_json(json_path, pptx_path):
         print(f"Error loading presentation '{pptx_path}': {e}")
         return False
 
-    if len(prs.slides) == 0 and len(all_slides_data) > 0:
-        print(f"Warning: The presentation '{pptx_path}' is empty, but JSON data exists.")
+    # Reading prs.slides renames slide parts to /ppt/slides/slideN.xml in presentation order,
+    # which no longer matches the archive once slides were reordered, so record the names first
+    original_partnames = {part: part.partname for part in prs.part.package.iter_parts()}
+
+    # Materialize the slide list once instead of re-walking prs.slides per JSON entry
+    slides = list(prs.slides)
+    n_slides = len(slides)
+
+    if n_slides == 0 and (streaming or len(all_slides_data) > 0):
+        logger.warning("Warning: The presentation '%s' is empty, but JSON data exists.", pptx_path)
         # Decide if you want to proceed or return, for now, let's proceed carefully
 
     updated_slides_count = 0
     updated_shapes_count = 0
+    changed_slides = []
+    unchanged_shapes_count = 0
+    missing_shape_ids = {}
 
-    for slide_data in all_slides_data:
+    # Apply entries slide by slide: a stable sort groups all entries for the same slide
+    # (keeping their JSON order) so each slide is looked up and indexed only once
+    def slide_sort_key(slide_data):
         slide_idx = slide_data.get("slide_index")
-        if slide_idx is None:
-            print(f"Warning: Slide data missing 'slide_index'. Skipping: {slide_data.get('slide_layout_name', 'Unknown slide')}")
-            continue
-
-        if slide_idx >= len(prs.slides):
-            print(f"Warning: slide_index {slide_idx} from JSON is out of bounds for presentation with {len(prs.slides)} slides. Skipping.")
-            continue
+        return (False, 0) if slide_idx is None else (True, slide_idx)
 
-        slide = prs.slides[slide_idx]
-        shapes_data = slide_data.get("shapes", [])
-        slide_updated_this_iteration = False
+    # A streamed document is not sorted (that would load it all); its consecutive entries for
+    # the same slide are still grouped, which is already the case for extracted slide details
+    ordered_slides_data = all_slides_data if streaming else sorted(all_slides_data, key=slide_sort_key)
 
-        for shape_data in shapes_data:
-            shape_id = shape_data.get("shape_id")
-            new_text = shape_data.get("text") # Expecting new text here
+    # A streamed document is parsed while it is applied, so decode errors surface here
+    try:
+        for _, slide_group in groupby(ordered_slides_data, key=slide_sort_key):
+            slide_group = list(slide_group)
+            slide_idx = slide_group[0].get("slide_index")
+            if slide_idx is None:
+                for slide_data in slide_group:
+                    logger.warning("Warning: Slide data missing 'slide_index'. Skipping: %s", slide_data.get('slide_layout_name', 'Unknown slide'))
+                continue
 
-            if shape_id is None:
-                print(f"Warning: Shape data on slide {slide_idx} missing 'shape_id'. Skipping shape.")
+            if slide_idx >= n_slides:
+                logger.warning("Warning: slide_index %s from JSON is out of bounds for presentation with %d slides. Skipping.", slide_idx, n_slides)
                 continue
 
-            found_shape = None
-            for s in slide.shapes:
-                if s.shape_id == shape_id:
-                    found_shape = s
-                    break
-            
-            if found_shape:
-                if found_shape.has_text_frame and new_text is not None: # Only update if new_text is provided
-                    # Clear existing content to ensure formatting is based on the shape's style
-                    # not carried over from old paragraph runs if they had different styles.
-                    found_shape.text_frame.clear() 
-                    
-                    # Split the input text by newline characters
-                    lines = new_text.split('\n')
-                    
-                    # Handle case where new_text might be an empty string,
-                    # which split('\n') results in [''].
-                    # If new_text was truly empty, we want one empty paragraph.
-                    # If new_text had content, lines will have that content.
-                    if not lines and new_text == "": # Handles empty string input correctly
-                        p = found_shape.text_frame.add_paragraph()
-                        p.text = "" # Explicitly set an empty paragraph
-                    else:
-                        for line_content in lines:
-                            # Each line becomes a new paragraph.
-                            # This new paragraph will inherit the style (including bullet formatting)
-                            # from the text frame or its placeholder definition in the template.
-                            p = found_shape.text_frame.add_paragraph()
-                            p.text = line_content
-                            
-                    updated_shapes_count += 1
-                    if not slide_updated_this_iteration:
-                        updated_slides_count +=1
-                        slide_updated_this_iteration = True
-                elif not found_shape.has_text_frame and new_text is not None:
-                    print(f"Warning: Shape ID {shape_id} on slide {slide_idx} does not have a text frame. Cannot update text: '{new_text[:50]}...'")
-            else:
-                print(f"Warning: Shape with ID {shape_id} not found on slide {slide_idx}. Skipping update for this shape.")
+            shapes_data = [shape_data for slide_data in slide_group for shape_data in slide_data.get("shapes", [])]
+            slide_updated_shapes, slide_unchanged_shapes, slide_missing_shape_ids = _update_slide_shapes(slides[slide_idx], slide_idx, shapes_data)
+            updated_shapes_count += slide_updated_shapes
+            unchanged_shapes_count += slide_unchanged_shapes
+            if slide_updated_shapes:
+                updated_slides_count += 1
+                changed_slides.append(slides[slide_idx])
+            if slide_missing_shape_ids:
+                missing_shape_ids.setdefault(slide_idx, []).extend(slide_missing_shape_ids)
+    except STREAMING_JSON_ERRORS as e:
+        print(f"Error: Could not decode JSON from '{json_path}': {e}")
+        return False
+
+    for slide_idx, shape_ids in missing_shape_ids.items():
+        logger.warning("Warning: Shapes with IDs %s not found on slide %s. Skipped updates for these shapes.",
+                       ", ".join(map(str, shape_ids)), slide_idx)
 
     try:
-        prs.save(pptx_path)
+        _save_changed_slides(pptx_path, changed_slides, original_partnames)
         print(f"Presentation '{pptx_path}' updated successfully.")
         print(f"Updated text in {updated_shapes_count} shapes across {updated_slides_count} slides.")
+        if unchanged_shapes_count:
+            print(f"Skipped {unchanged_shapes_count} shapes whose text was already up to date.")
         return True
     except Exception as e:
         print(f"Error saving presentation '{pptx_path}': {e}")